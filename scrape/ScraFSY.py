@@ -20,10 +20,536 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
 from bs4 import BeautifulSoup as soup
 import pandas as pd
 import time as waktu
 import numpy as np
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import queue
+import threading
+import lxml.html
+
+#Multiplier of value suffix in Yahoo table
+SUFFIX_SCALE={'K':1e3,'M':1e6,'B':1e9}
+
+#Script that read navigation timing, resources, and memory of the page
+PAGE_TIMING_SCRIPT='''
+var nav=performance.getEntriesByType('navigation')[0]||{};
+var resources=performance.getEntriesByType('resource');
+var bytes=nav.transferSize||0;
+for(var i=0;i<resources.length;i++){bytes+=resources[i].transferSize||0;}
+return {
+    dom_content_loaded_ms:nav.domContentLoadedEventEnd||0,
+    load_event_ms:nav.loadEventEnd||0,
+    resources:resources.length,
+    transfer_bytes:bytes,
+    js_heap_bytes:(performance.memory||{}).usedJSHeapSize||0
+};
+'''
+
+#XPath of financial statement table rows and currency notes
+ROW_XPATH='//div[contains(concat(" ",normalize-space(@class)," ")," D(tbr) ")]'
+NOTE_XPATH='//span[contains(concat(" ",normalize-space(@class)," ")," Fz(xs) ")]'
+
+#Hosts of ads and analytics that are not needed for the statement table
+BLOCKED_HOSTS=[
+    '*doubleclick.net*','*googlesyndication.com*','*google-analytics.com*',
+    '*googletagmanager.com*','*googletagservices.com*','*adservice.google.com*',
+    '*amazon-adsystem.com*','*scorecardresearch.com*','*criteo.com*','*criteo.net*',
+    '*taboola.com*','*outbrain.com*','*moatads.com*','*facebook.net*',
+    '*analytics.yahoo.com*','*ads.yahoo.com*','*advertising.com*','*yimg.com/rq/darla*',
+]
+
+class ScrapeError(Exception):
+    '''Base error of a failed scrape of one statement.
+
+    Args:
+        message (str): Explanation of the error.
+        company_code (:obj:`str`, optional): The company code. Defaults to None.
+        statement (:obj:`str`, optional): The statement. Defaults to None.
+    '''
+    def __init__(self,message,company_code=None,statement=None):
+        super().__init__(message)
+        self.company_code=company_code
+        self.statement=statement
+
+class NavigationError(ScrapeError):
+    '''Raised when the statement page can not be loaded or its table does not appear.'''
+
+class ParseError(ScrapeError):
+    '''Raised when the table rows can not be found in the HTML.'''
+
+class TableFormatError(ScrapeError):
+    '''Raised when the parsed table can not be turned into a dataframe.'''
+
+class CacheMissError(ScrapeError,LookupError):
+    '''Raised in cache-only mode when the response is not in the cache.'''
+
+def error_text(error):
+    '''Describe an error for the failure report.
+
+    Args:
+        error (Exception): The error of a failed statement.
+
+    Returns:
+        text (str): Name and message of the error, followed by the error
+            that caused it (Ex: the 404 behind NavigationError).
+    '''
+    text=f'{type(error).__name__}: {error}'
+    if error.__cause__ is not None:
+        text += f' (caused by {error_text(error.__cause__)})'
+    return text
+
+#Scrape metrics object constructor
+class ScrapeMetrics():
+    '''
+    A class that collect stage timers and event counters of scrape sessions
+
+    One ScrapeMetrics can be shared by many sessions and threads.
+
+    Examples:
+        >>> metrics=ScrapeMetrics()
+        >>> bca=YFinanceScrapper('BBCA.JK',instrumentation=metrics)
+        >>> bca.get_alldata()
+        >>> print(metrics.to_prometheus())
+
+    Args:
+        hooks (:obj:`list`, optional): Functions that receive the snapshot
+            dictionary when publish is called. Defaults to None.
+
+    Attributes:
+        calls (dict): Dictionary that contain stage as key and number of runs
+            as value.
+        counters (dict): Dictionary that contain event (Ex: 'retries') as key
+            and count as value.
+        hooks (list): Functions that receive the snapshot dictionary.
+        seconds (dict): Dictionary that contain stage as key and total seconds
+            as value.
+        slowest (dict): Dictionary that contain stage as key and seconds of
+            the slowest run as value.
+    '''
+    #Function for initialization of object
+    def __init__(self,hooks=None):
+        self.seconds={}
+        self.calls={}
+        self.slowest={}
+        self.counters={}
+        self.hooks=list(hooks) if hooks is not None else []
+        self.lock=threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self,name):
+        '''Time the code inside the with block as one run of a stage.
+
+        When the block raise an error, the '<stage>_errors' counter is
+        increased and the error is raised again.
+
+        Examples:
+            >>> with metrics.stage('parse'):
+            ...     bca.parse_data(bca.content,'Income Statement')
+
+        Args:
+            name (str): Name of the stage.
+        '''
+        start=waktu.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.count(f'{name}_errors')
+            raise
+        finally:
+            self.record(name,waktu.perf_counter()-start)
+
+    def record(self,name,seconds):
+        '''Add one run of a stage.
+
+        Args:
+            name (str): Name of the stage.
+            seconds (float): Seconds of the run.
+        '''
+        with self.lock:
+            self.seconds[name]=self.seconds.get(name,0.0)+seconds
+            self.calls[name]=self.calls.get(name,0)+1
+            self.slowest[name]=max(self.slowest.get(name,0.0),seconds)
+
+    def count(self,event,amount=1):
+        '''Increase the counter of an event.
+
+        Args:
+            event (str): Name of the event (Ex: 'retries' or 'failures').
+            amount (:obj:`int`, optional): Increase. Defaults to 1.
+        '''
+        with self.lock:
+            self.counters[event]=self.counters.get(event,0)+amount
+
+    def snapshot(self):
+        '''Copy the current timers and counters.
+
+        Returns:
+            snapshot (dict): 'stages' with seconds, calls, and max_seconds of
+                every stage, and 'counters' with count of every event.
+        '''
+        with self.lock:
+            stages={name:{'seconds':self.seconds[name],'calls':self.calls[name],
+                'max_seconds':self.slowest[name]} for name in self.seconds}
+            return {'stages':stages,'counters':dict(self.counters)}
+
+    def to_json(self,path=None):
+        '''Export the snapshot as JSON.
+
+        Args:
+            path (:obj:`str`, optional): Location of the file that is written.
+                Defaults to None (only return the text).
+
+        Returns:
+            text (str): JSON text of the snapshot.
+        '''
+        text=json.dumps(self.snapshot(),indent=2,sort_keys=True)
+        if path is not None:
+            with open(path,'w') as file:
+                file.write(text)
+        return text
+
+    def to_prometheus(self,prefix='scrafsy'):
+        '''Export the snapshot in Prometheus text format.
+
+        Args:
+            prefix (:obj:`str`, optional): Prefix of metric names.
+                Defaults to 'scrafsy'.
+
+        Returns:
+            text (str): Prometheus exposition text of the snapshot.
+        '''
+        snapshot=self.snapshot()
+        lines=[]
+        metrics=[
+            ('stage_seconds_total','counter','Seconds spent in each stage.','seconds'),
+            ('stage_calls_total','counter','Number of runs of each stage.','calls'),
+            ('stage_max_seconds','gauge','Seconds of the slowest run of each stage.','max_seconds'),
+        ]
+        for name, kind, text, key in metrics:
+            lines.append(f'# HELP {prefix}_{name} {text}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+            for stage, values in sorted(snapshot['stages'].items()):
+                lines.append(f'{prefix}_{name}{{stage="{stage}"}} {values[key]}')
+        lines.append(f'# HELP {prefix}_events_total Number of retries, failures, and other events.')
+        lines.append(f'# TYPE {prefix}_events_total counter')
+        for event, value in sorted(snapshot['counters'].items()):
+            lines.append(f'{prefix}_events_total{{event="{event}"}} {value}')
+        return '\n'.join(lines)+'\n'
+
+    def publish(self):
+        '''Give the snapshot to every hook.
+
+        Examples:
+            >>> metrics = ScrapeMetrics(hooks=[lambda snapshot: print(snapshot['counters'])])
+            >>> metrics.publish()
+
+        '''
+        snapshot=self.snapshot()
+        for hook in self.hooks:
+            hook(snapshot)
+
+    def reset(self):
+        '''Remove all timers and counters.'''
+        with self.lock:
+            self.seconds={}
+            self.calls={}
+            self.slowest={}
+            self.counters={}
+
+#Browser profile object constructor
+class BrowserProfile():
+    '''
+    A class that represent the Chrome settings of the web drivers
+
+    The default profile is lean: headless, without images, stylesheets,
+    fonts, extensions, ads and trackers, and the page is taken as loaded
+    when the DOM is ready. Use BrowserProfile.full() for normal Chrome.
+
+    Examples:
+        >>> profile=BrowserProfile(block_stylesheets=False)
+        >>> pool=DriverPool(profile=profile)
+
+    Args:
+        headless (:obj:`bool`, optional): Run the browser without window.
+            Defaults to True.
+        block_images (:obj:`bool`, optional): Do not load images. Defaults to True.
+        block_stylesheets (:obj:`bool`, optional): Do not load stylesheets.
+            Defaults to True.
+        block_fonts (:obj:`bool`, optional): Do not load web fonts. Defaults to True.
+        blocked_urls (:obj:`list`, optional): URL patterns that are blocked.
+            Defaults to BLOCKED_HOSTS.
+        page_load_strategy (:obj:`str`, optional): 'normal', 'eager', or 'none'.
+            Defaults to 'eager'.
+        disable_extensions (:obj:`bool`, optional): Disable Chrome extensions.
+            Defaults to True.
+
+    Attributes:
+        block_fonts (bool): Do not load web fonts.
+        block_images (bool): Do not load images.
+        block_stylesheets (bool): Do not load stylesheets.
+        blocked_urls (list): URL patterns that are blocked.
+        disable_extensions (bool): Disable Chrome extensions.
+        headless (bool): Run the browser without window.
+        page_load_strategy (str): When the page is taken as loaded.
+    '''
+    #Function for initialization of object
+    def __init__(self,headless=True,block_images=True,block_stylesheets=True,block_fonts=True,
+            blocked_urls=None,page_load_strategy='eager',disable_extensions=True):
+        self.headless=headless
+        self.block_images=block_images
+        self.block_stylesheets=block_stylesheets
+        self.block_fonts=block_fonts
+        self.blocked_urls=list(BLOCKED_HOSTS if blocked_urls is None else blocked_urls)
+        self.page_load_strategy=page_load_strategy
+        self.disable_extensions=disable_extensions
+
+    @classmethod
+    def full(cls,headless=True):
+        '''Profile that load everything like normal Chrome.
+
+        Args:
+            headless (:obj:`bool`, optional): Run the browser without window.
+                Defaults to True.
+
+        Returns:
+            profile (BrowserProfile): Profile without any blocking.
+        '''
+        return cls(headless=headless,block_images=False,block_stylesheets=False,
+            block_fonts=False,blocked_urls=[],page_load_strategy='normal',
+            disable_extensions=False)
+
+    def options(self):
+        '''Create Chrome options of the profile.
+
+        Returns:
+            options (selenium.webdriver.chrome.options.Options): Chrome options.
+        '''
+        options=Options()
+        if self.headless:
+            options.add_argument('--headless')
+        if self.disable_extensions:
+            options.add_argument('--disable-extensions')
+        options.page_load_strategy=self.page_load_strategy
+        prefs={}
+        if self.block_images:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            prefs['profile.managed_default_content_settings.images']=2
+        if self.block_stylesheets:
+            prefs['profile.managed_default_content_settings.stylesheets']=2
+        if prefs:
+            options.add_experimental_option('prefs',prefs)
+        return options
+
+    def url_patterns(self):
+        '''URL patterns that are blocked in the browser.
+
+        Returns:
+            patterns (list): List of URL pattern.
+        '''
+        patterns=list(self.blocked_urls)
+        if self.block_images:
+            patterns += ['*.png*','*.jpg*','*.jpeg*','*.gif*','*.webp*','*.svg*']
+        if self.block_stylesheets:
+            patterns += ['*.css*']
+        if self.block_fonts:
+            patterns += ['*.woff*','*.ttf*','*.otf*','*.eot*']
+        return patterns
+
+    def apply(self,driver):
+        '''Block the URL patterns in a started web driver.
+
+        Args:
+            driver (selenium.webdriver.Chrome): Web driver of the profile.
+        '''
+        patterns=self.url_patterns()
+        if patterns:
+            driver.execute_cdp_cmd('Network.enable',{})
+            driver.execute_cdp_cmd('Network.setBlockedURLs',{'urls':patterns})
+
+#Driver pool object constructor
+class DriverPool():
+    '''
+    A class that represent a pool of reusable Chrome web drivers
+
+    One pool can be shared by many scrape sessions, so one browser serves
+    all statements of a company and many companies in a row.
+
+    Examples:
+        >>> pool=DriverPool(size=2)
+        >>> bca=YFinanceScrapper('BBCA.JK',pool=pool)
+        >>> bca.get_alldata()
+        >>> pool.close()
+
+    Args:
+        path (:obj:`str`, optional): Location of chromedriver.
+            Defaults to '/usr/local/bin/chromedriver'.
+        size (:obj:`int`, optional): Maximum number of drivers in the pool.
+            Defaults to 1.
+        max_pages (:obj:`int`, optional): Number of pages that one driver
+            can load before it is recycled. Defaults to 50.
+        profile (:obj:`BrowserProfile`, optional): Chrome settings of the drivers,
+            include the headless setting. Defaults to None (lean BrowserProfile).
+
+    Attributes:
+        created (int): Number of drivers that are alive in the pool.
+        idle (queue.LifoQueue): Drivers that are ready to be checked out.
+        max_pages (int): Number of pages that one driver can load before
+            it is recycled.
+        pages (dict): Dictionary that contain driver as key and number of
+            loaded pages as value.
+        path (str): Location of chromedriver.
+        profile (BrowserProfile): Chrome settings of the drivers.
+        size (int): Maximum number of drivers in the pool.
+    '''
+    #Function for initialization of object
+    def __init__(self,path='/usr/local/bin/chromedriver',size=1,max_pages=50,profile=None):
+        self.path=path
+        self.size=size
+        self.max_pages=max_pages
+        self.profile=BrowserProfile() if profile is None else profile
+        self.created=0
+        self.pages={}
+        self.idle=queue.LifoQueue()
+        self.lock=threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+    def new_driver(self):
+        '''Start a new Chrome web driver.
+
+        Returns:
+            driver (selenium.webdriver.Chrome): New web driver.
+        '''
+        driver=webdriver.Chrome(service=Service(self.path),options=self.profile.options())
+        try:
+            self.profile.apply(driver)
+        except Exception:
+            driver.quit()
+            raise
+        return driver
+
+    def is_alive(self,driver):
+        '''Check whether the web driver still respond.
+
+        Args:
+            driver (selenium.webdriver.Chrome): Web driver that is checked.
+
+        Returns:
+            alive (bool): True if the driver can still run script.
+        '''
+        try:
+            driver.execute_script('return 1;')
+            return True
+        except Exception:
+            return False
+
+    def acquire(self,timeout=None):
+        '''Check out a healthy web driver from the pool.
+
+        A new driver is started when there is no idle driver and the pool
+        is not full yet, otherwise it waits until one is returned.
+
+        Examples:
+            >>> pool=DriverPool()
+            >>> driver=pool.acquire()
+            >>> pool.release(driver)
+
+        Args:
+            timeout (:obj:`float`, optional): Maximum seconds to wait for
+                a driver. Defaults to None (wait forever).
+
+        Returns:
+            driver (selenium.webdriver.Chrome): Web driver that is ready to use.
+        '''
+        deadline=None if timeout is None else waktu.monotonic()+timeout
+        while True:
+            try:
+                driver=self.idle.get_nowait()
+            except queue.Empty:
+                driver=None
+            if driver is not None:
+                if self.is_alive(driver):
+                    return driver
+                self.discard(driver)
+                continue
+            with self.lock:
+                can_create=self.created < self.size
+                if can_create:
+                    self.created += 1
+            if can_create:
+                try:
+                    driver=self.new_driver()
+                except Exception:
+                    with self.lock:
+                        self.created -= 1
+                    raise
+                self.pages[driver]=0
+                return driver
+            if deadline is not None and waktu.monotonic() >= deadline:
+                raise TimeoutError('No web driver is available in the pool')
+            #Wait shortly so discarded drivers free their slot
+            try:
+                driver=self.idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self.idle.put(driver)
+
+    def release(self,driver,broken=False):
+        '''Return a web driver to the pool.
+
+        The driver is recycled when it already loaded max_pages pages or
+        when it is broken.
+
+        Args:
+            driver (selenium.webdriver.Chrome): Web driver that is returned.
+            broken (:obj:`bool`, optional): Mark the driver as unusable.
+                Defaults to False.
+        '''
+        self.pages[driver]=self.pages.get(driver,0)+1
+        if broken or self.pages[driver] >= self.max_pages:
+            self.discard(driver)
+        else:
+            self.idle.put(driver)
+
+    def discard(self,driver):
+        '''Quit a web driver and free its slot in the pool.
+
+        Args:
+            driver (selenium.webdriver.Chrome): Web driver that is discarded.
+        '''
+        self.pages.pop(driver,None)
+        with self.lock:
+            self.created -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        '''Quit all idle web drivers in the pool.
+
+        Examples:
+            >>> pool=DriverPool()
+            >>> pool.close()
+
+        '''
+        while True:
+            try:
+                driver=self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(driver)
 
 #Scrape session object construcor
 class YFinanceScrapper():
@@ -36,34 +562,64 @@ class YFinanceScrapper():
     Args:
         company_code (str): The company code that
             you want to scrape 
+        pool (:obj:`DriverPool`, optional): Pool of web drivers that is
+            shared between scrape sessions. Defaults to None.
+        fetcher (:obj:`fetcher.BaseFetcher`, optional): Fetcher that retrieve
+            statement data without browser. Defaults to None.
+        cache (:obj:`cache.ResponseCache`, optional): On-disk cache of the
+            statement html. Defaults to None.
+        instrumentation (:obj:`ScrapeMetrics`, optional): Stage timers and counters
+            that can be shared between sessions. Defaults to None (a new one).
             
     Attributes:
         address (dict): Dictionary that contain statement as key and
             yahoo adress as value.
         balance_sheet (pandas.Dataframe): A pandas Dataframe that contain
             balance sheet statement data.
+        cache (cache.ResponseCache): On-disk cache of the statement html.
         cash_flow (pandas.Dataframe): A pandas Dataframe that contain
             cash flow statement data.
+        click_timeout (float): Maximum seconds to wait for the Quarterly and
+            Expand All buttons.
         company_code (str): The company code that you want to scrape.
         collect (list): A list that contain all name of features and their value.
         content (bs4.BeautifulSoup): BeautifulSoup object that contain Yahoo Finance
-            HTML file in Pythonic idioms.
+            HTML file in Pythonic idioms, or the raw HTML when parser is 'lxml'.
         features (list): A list that contain name of features those are collected.
+        fetcher (fetcher.BaseFetcher): Fetcher that retrieve statement data without
+            browser. When it fail or it is None, Selenium is used.
         headers (list): A list that contain name of headers in Yahoo Finance
             financial statements table.
+        html (str): HTML of the last page that is loaded by the browser, it is
+            cached after its table is parsed. None when the page come from cache.
         imp_dataframe (pandas.Dataframe): A pandas Dataframe that contain
             selected features from each statement. 
         income_statement (pandas.Dataframe): A pandas Dataframe that contain
             income statement data.
+        instrumentation (ScrapeMetrics): Timers of the stages (cache, driver,
+            navigation, clicks, wait, extract, soup, fetch, parse, dataframe) and
+            counters of pages, cache hits, fetcher fallbacks, retries, and failures.
         metric (pandas.Dataframe): A pandas Dataframe that contain
             selected financial metrics from selected features.
         note (list): A list that contain note that explain value (Ex:Currency).
+        page_timings (dict): Dictionary that contain statement as key and load
+            time, resources, transferred bytes, and JS heap of the page as value.
+        parser (str): 'bs4' parse the whole page with BeautifulSoup, 'lxml' scan
+            only the table rows with lxml in one pass. Both give the same result.
         path (str): Location of chromedriver.
+        pool (DriverPool): Pool of web drivers that is used for scraping.
+            When it is None, a temporary pool is made for each scrape.
+        ready_poll (float): Seconds between two checks of the table rows.
+        ready_stable (float): Seconds the number of table rows must stay
+            the same before the table is taken as ready.
+        ready_timeout (float): Maximum seconds to wait for the table.
         table_choice (list): List of statement that can be chosen.
         time (list): List of periodic of collected data.
+        time_saved (dict): Dictionary that contain statement as key and seconds
+            saved compared to waiting the full ready_timeout as value.
     '''
     #Function for initialization of object
-    def __init__(self,company_code):
+    def __init__(self,company_code,pool=None,fetcher=None,cache=None,instrumentation=None):
         self.income_statement=None
         self.note=[]
         self.metric=None
@@ -71,11 +627,23 @@ class YFinanceScrapper():
         self.cash_flow=None
         self.imp_dataframe=None
         self.path='/usr/local/bin/chromedriver'
+        self.pool=pool
+        self.fetcher=fetcher
+        self.cache=cache
+        self.instrumentation=instrumentation if instrumentation is not None else ScrapeMetrics()
+        self.parser='bs4'
         self.content=None
+        self.html=None
         self.features=['Company','Time']
         self.collect=[]
         self.time=[]
         self.headers=[]
+        self.ready_timeout=10
+        self.click_timeout=20
+        self.ready_poll=0.25
+        self.ready_stable=1.0
+        self.time_saved={}
+        self.page_timings={}
         self.company_code=company_code
         self.table_choice=['Income Statement','Balance Sheet','Cash Flow']
         self.address={
@@ -100,33 +668,147 @@ class YFinanceScrapper():
 
         Returns:
             content (bs4.BeautifulSoup): BeautifulSoup object that contain Yahoo Finance 
-                HTML file in Pythonic idioms.
+                HTML file in Pythonic idioms, or the raw HTML when parser is 'lxml'.
+
+        Raises:
+            ValueError: When the statement is not in table_choice.
+            NavigationError: When the page or its table can not be loaded.
         '''
+        if statement not in self.table_choice:
+            raise ValueError('Your statement input is wrong')
+        self.html=None
+        #Use cached html when it is still fresh
+        if self.cache is not None:
+            with self.instrumentation.stage('cache'):
+                html=self.cache.get(self.company_code,statement)
+            if html is not None:
+                self.instrumentation.count('cache_hits')
+                with self.instrumentation.stage('soup'):
+                    self.content = self.make_content(html)
+                return self.content
+        #Check out web driver from pool
+        pool=self.pool if self.pool is not None else DriverPool(self.path)
+        driver=None
+        broken=False
         try:
-            #Initiate web driver
-            driver=webdriver.Chrome(self.path)
-            if statement in self.table_choice:
-                #Access link
+            with self.instrumentation.stage('driver'):
+                driver=pool.acquire()
+            #Access link
+            with self.instrumentation.stage('navigation'):
+                started=waktu.monotonic()
                 driver.get(self.address[statement])
-            else :
-                print('Your statement input is wrong')
-            #Wait until web appear and then select period of data
-            WebDriverWait(driver,20).until(
-                EC.element_to_be_clickable((By.XPATH,'//span[text()="Quarterly"]'))).click()
-            #Wait until web appear and then select period of data
-            WebDriverWait(driver,20).until(
-                EC.element_to_be_clickable((By.XPATH,'//span[text()="Expand All"]'))).click()
-            #Wait until web appear and ready take the html
-            waktu.sleep(10)
+                load_seconds=waktu.monotonic()-started
+            self.instrumentation.count('pages')
+            with self.instrumentation.stage('clicks'):
+                #Wait until web appear and then select period of data
+                WebDriverWait(driver,self.click_timeout).until(
+                    EC.element_to_be_clickable((By.XPATH,'//span[text()="Quarterly"]'))).click()
+                #Wait until web appear and then select period of data
+                WebDriverWait(driver,self.click_timeout).until(
+                    EC.element_to_be_clickable((By.XPATH,'//span[text()="Expand All"]'))).click()
+            #Wait until the table rows stop changing and ready take the html
+            with self.instrumentation.stage('wait'):
+                waited=self.wait_until_ready(driver,statement)
+            self.time_saved[statement]=max(self.ready_timeout-waited,0)
+            self.page_timings[statement]=self.page_timing(driver,load_seconds)
             #Create html element
-            html = driver.execute_script('return document.body.innerHTML;')
-            #Connect to Beautiful Soup for Parsing
-            self.content = soup(html,'lxml')
-            #Close the wesite
-            driver.quit()
-            return self.content
-        except:
-            print('There is change in html structure, Please inform this error to us!')
+            with self.instrumentation.stage('extract'):
+                html = driver.execute_script('return document.body.innerHTML;')
+        except NavigationError:
+            broken=True
+            self.instrumentation.count('failures')
+            raise
+        except Exception as exc:
+            broken=True
+            self.instrumentation.count('failures')
+            raise NavigationError(f'Can not load {statement} of {self.company_code}, '
+                'there may be change in html structure',self.company_code,statement) from exc
+        finally:
+            #Return the driver, or close it when the pool is temporary
+            if driver is not None:
+                pool.release(driver,broken=broken)
+            if pool is not self.pool:
+                pool.close()
+        #Keep the page, it is cached after its table is parsed
+        self.html=html
+        #Connect to Beautiful Soup for Parsing
+        with self.instrumentation.stage('soup'):
+            self.content = self.make_content(html)
+        return self.content
+
+    def page_timing(self,driver,load_seconds):
+        '''Collect load time and size of the page that is shown in the driver.
+
+        Args:
+            driver (selenium.webdriver.Chrome): Web driver that show the page.
+            load_seconds (float): Seconds spent in driver.get.
+
+        Returns:
+            timing (dict): load_seconds, dom_content_loaded_ms, load_event_ms,
+                resources, transfer_bytes, and js_heap_bytes of the page.
+        '''
+        timing={'load_seconds':load_seconds}
+        try:
+            timing.update(driver.execute_script(PAGE_TIMING_SCRIPT))
+        except Exception:
+            pass
+        return timing
+
+    def make_content(self,html):
+        '''Prepare HTML for the selected parser.
+
+        Args:
+            html (str): HTML of Yahoo Finance page.
+
+        Returns:
+            content (bs4.BeautifulSoup): BeautifulSoup object of the HTML, or
+                the HTML itself when parser is 'lxml'.
+        '''
+        if self.parser == 'lxml':
+            return html
+        return soup(html,'lxml')
+
+    def wait_until_ready(self,driver,statement=None):
+        '''Wait until the rows of financial statement table are stable.
+
+        The number of D(tbr) rows is checked every ready_poll seconds. The
+        table is ready when it has rows and the number does not change for
+        ready_stable seconds, or when ready_timeout is reached.
+
+        Examples:
+            >>> bca = YFinanceScrapper('BBCA.JK')
+            >>> waited = bca.wait_until_ready(driver)
+
+        Args:
+            driver (selenium.webdriver.Chrome): Web driver that show the table.
+            statement (:obj:`str`, optional): The statement of the page.
+                Defaults to None.
+
+        Returns:
+            waited (float): Seconds spent waiting for the table.
+
+        Raises:
+            NavigationError: When no row appear before ready_timeout.
+        '''
+        start=waktu.monotonic()
+        last_count=-1
+        stable_since=start
+        while True:
+            now=waktu.monotonic()
+            if now-start >= self.ready_timeout:
+                break
+            count=driver.execute_script(
+                "return document.getElementsByClassName('D(tbr)').length;")
+            if count != last_count:
+                last_count=count
+                stable_since=now
+            elif count > 0 and now-stable_since >= self.ready_stable:
+                break
+            waktu.sleep(self.ready_poll)
+        if last_count <= 0:
+            raise NavigationError(f'There is no table in {statement} of {self.company_code} '
+                f'after {self.ready_timeout} seconds',self.company_code,statement)
+        return waktu.monotonic()-start
 
     def parse_data(self,content,statement):
         '''Parse JSON file from Yahoo Finance to get data in Financial Statements.
@@ -137,14 +819,20 @@ class YFinanceScrapper():
 
         Args:
             content (bs4.BeautifulSoup): BeautifulSoup object that contain Yahoo Finance
-                HTML file in Pythonic idioms.
+                HTML file in Pythonic idioms. Raw HTML (str) is parsed with
+                parse_table_lxml.
             statement (str): The selected statement that is gonna be scraped.
 
         Returns:
             collect (list): A list that contain all name of features and their value.
             headers (list): A list that contain name of headers in the table.
             time (list): List of periodic of collected data.
+
+        Raises:
+            ParseError: When the table rows can not be found.
         '''
+        if isinstance(content,str):
+            return self.parse_table_lxml(content,statement)
         try:
             #Find note of the currency
             notes = content.find_all('span', class_='Fz(xs)')
@@ -179,8 +867,69 @@ class YFinanceScrapper():
             for item in self.collect:
                 del item[1:3]
             return self.collect, self.headers, self.time
-        except:
-            print('There are change in table format of financial statements, Please inform this error to us!')
+        except Exception as exc:
+            self.instrumentation.count('failures')
+            raise ParseError(f'Can not parse {statement} of {self.company_code}, '
+                'there may be change in table format',self.company_code,statement) from exc
+
+    def parse_table_lxml(self,html,statement):
+        '''Parse table rows of Yahoo Finance HTML with lxml in one pass.
+
+        Only the D(tbr) rows are visited, and every row is walked once to
+        collect its headers, features, and values. The result is the same as
+        parse_data with BeautifulSoup object.
+
+        Examples:
+            >>> bca = YFinanceScrapper('BBCA.JK')
+            >>> bca.parser = 'lxml'
+            >>> collect, headers, time = bca.parse_data(bca.get_html_data('Income Statement'),'Income Statement')
+
+        Args:
+            html (str): HTML of Yahoo Finance page.
+            statement (str): The selected statement that is gonna be scraped.
+
+        Returns:
+            collect (list): A list that contain all name of features and their value.
+            headers (list): A list that contain name of headers in the table.
+            time (list): List of periodic of collected data.
+
+        Raises:
+            ParseError: When the table rows can not be found.
+        '''
+        try:
+            tree=lxml.html.document_fromstring(html)
+            #Find note of the currency
+            for noted in tree.xpath(NOTE_XPATH):
+                self.note.append(noted.text_content())
+            rows=tree.xpath(ROW_XPATH)
+            if not rows:
+                raise IndexError('There is no table row')
+            for index, row in enumerate(rows):
+                data=[]
+                for element in row.iter('div','span'):
+                    if element is row:
+                        continue
+                    if element.tag == 'span':
+                        #First row contain the headers
+                        if index == 0:
+                            self.headers.append(element.text_content())
+                        if 'Va(m)' in (element.get('class') or '').split():
+                            self.features.append(element.text_content())
+                    elif index > 0:
+                        data.append(element.text_content())
+                if index > 0:
+                    del data[1:3]
+                    self.collect.append(data)
+            #Create list of time
+            if statement != 'Balance Sheet':
+                self.time=self.headers[2:]
+            elif statement == 'Balance Sheet':
+                self.time=self.headers[1:]
+            return self.collect, self.headers, self.time
+        except Exception as exc:
+            self.instrumentation.count('failures')
+            raise ParseError(f'Can not parse {statement} of {self.company_code}, '
+                'there may be change in table format',self.company_code,statement) from exc
 
     def create_dataframe(self,collect,headers,time,statement):
         '''Create dataframe from data that already collected from parsing process.
@@ -198,6 +947,9 @@ class YFinanceScrapper():
 
         Returns:
             df2 (pandas.Dataframe): Dataframe that contain data from selected statement.
+
+        Raises:
+            TableFormatError: When the table can not be turned into dataframe.
         '''
         try:
             df=pd.DataFrame(collect,columns=headers)
@@ -211,13 +963,15 @@ class YFinanceScrapper():
                 df2=df2.drop([0,1]).reset_index(drop=True)
             elif statement =='Balance Sheet':
                 df2=df2.drop([0]).reset_index(drop=True)
-            df2=df2.applymap(self.value_to_num)
+            df2=self.frame_to_num(df2)
             df2['Time']=pd.to_datetime(time)
             df2['Company']=self.company_code
             df2=df2[self.features]
             return df2
-        except:
-            print('There are change in structure of financial statement table, please inform us this error!')
+        except Exception as exc:
+            self.instrumentation.count('failures')
+            raise TableFormatError(f'Can not create dataframe of {statement} of {self.company_code}, '
+                'there may be change in structure of table',self.company_code,statement) from exc
 
     def get_finance_data(self, statement):
         '''Retrieve dataframe that contains all data in selected statement.
@@ -237,20 +991,41 @@ class YFinanceScrapper():
             income_statement (pandas.Dataframe): A pandas Dataframe that contain
                 income statement data.
         '''
-        self.content=self.get_html_data(statement=statement)
-        self.collect, self.headers, self.time = self.parse_data(
-            content=self.content,statement=statement)
-        if statement=='Income Statement':
-            self.income_statement=self.create_dataframe(
+        fetched=False
+        if self.fetcher is not None:
+            try:
+                with self.instrumentation.stage('fetch'):
+                    features, self.collect, self.headers, self.time, note = self.fetcher.fetch_table(
+                        self.company_code,statement)
+                self.features.extend(features)
+                self.note.extend(noted for noted in note if noted not in self.note)
+                fetched=True
+            except CacheMissError:
+                #Cache-only mode must not go to the internet
+                raise
+            except Exception:
+                #Fall back to browser when the fetcher fail
+                self.instrumentation.count('fetcher_fallbacks')
+                self.reset_data()
+        if not fetched:
+            self.content=self.get_html_data(statement=statement)
+            with self.instrumentation.stage('parse'):
+                self.collect, self.headers, self.time = self.parse_data(
+                    content=self.content,statement=statement)
+            #Cache the page only when it has the table
+            if self.cache is not None and self.html is not None:
+                self.cache.put(self.company_code,statement,self.html)
+        with self.instrumentation.stage('dataframe'):
+            df=self.create_dataframe(
                 collect=self.collect,headers=self.headers,time=self.time,statement=statement)
+        if statement=='Income Statement':
+            self.income_statement=df
             return self.income_statement
         elif statement=='Balance Sheet':
-            self.balance_sheet=self.create_dataframe(
-                collect=self.collect,headers=self.headers,time=self.time,statement=statement)
+            self.balance_sheet=df
             return self.balance_sheet
         elif statement=='Cash Flow':
-            self.cash_flow=self.create_dataframe(
-                collect=self.collect,headers=self.headers,time=self.time,statement=statement)
+            self.cash_flow=df
             return self.cash_flow
     
     def reset_data(self,param1=None):
@@ -273,10 +1048,12 @@ class YFinanceScrapper():
             features (list): Set features to default for storing features.
             headeres (list): Empty list for storing headers of financial
                 statements table headers.
+            html (NoneType): Page that is not cached yet set to None.
             time (list): Empty list for storing periodic of
                 financial statements data.
         '''
         self.content=None
+        self.html=None
         self.features=['Company','Time']
         self.collect=[]
         self.time=[]
@@ -301,9 +1078,24 @@ class YFinanceScrapper():
             income_statement (pandas.Dataframe): A pandas Dataframe that contain
                 income statement data.
         '''
-        for statement in self.table_choice:
-            self.get_finance_data(statement=statement)
-            self.reset_data()
+        #Share one browser for all statements when there is no pool
+        temporary=self.pool is None
+        if temporary:
+            self.pool=DriverPool(self.path)
+        try:
+            for statement in self.table_choice:
+                self.get_finance_data(statement=statement)
+                self.reset_data()
+        except BaseException:
+            #Publish the failed session too, but a broken hook must not hide the scrape error
+            with contextlib.suppress(Exception):
+                self.instrumentation.publish()
+            raise
+        finally:
+            if temporary:
+                self.pool.close()
+                self.pool=None
+        self.instrumentation.publish()
 
     def convert_to_csv(self,name_of_table):
         '''Convert selected statements table to csv.
@@ -319,6 +1111,8 @@ class YFinanceScrapper():
         Returns:
             csv file of selected dataframe.
 
+        Raises:
+            ValueError: When name_of_table is not a table of the session.
         '''
         if name_of_table == 'income_statement':
             self.income_statement.to_csv(f'csv_files/{self.company_code}_{name_of_table}.csv')
@@ -331,11 +1125,44 @@ class YFinanceScrapper():
         elif name_of_table == "metric":
             self.metric.to_csv(f'csv_files/{self.company_code}_{name_of_table}.csv')
         else:
-            print('your input is false')
+            raise ValueError(f'There is no table {name_of_table}, choose one of '
+                "['income_statement', 'balance_sheet', 'cash_flow', 'imp_dataframe', 'metric']")
+
+    def convert_to_store(self,name_of_table,store,mode='upsert'):
+        '''Save selected statements table to Parquet or Feather dataset.
+
+        Examples:
+            >>> store = StatementStore('parquet_files')
+            >>> bca = YFinanceScrapper('BBCA.JK')
+            >>> df= bca.get_finance_data('Income Statement')
+            >>> bca.convert_to_store('income_statement',store)
+
+        Args:
+            name_of_table (str): Name of table.
+            store (storage.StatementStore): Dataset that keep the table.
+            mode (:obj:`str`, optional): 'overwrite', 'append', or 'upsert'.
+                Defaults to 'upsert'.
+
+        Returns:
+            rows (int): Number of stored rows of the company.
+
+        Raises:
+            ValueError: When name_of_table is not a table of the session.
+        '''
+        tables={
+            'income_statement':self.income_statement,
+            'balance_sheet':self.balance_sheet,
+            'cash_flow':self.cash_flow,
+            'imp_dataframe':self.imp_dataframe,
+            'metric':self.metric,
+        }
+        if name_of_table not in tables:
+            raise ValueError(f'There is no table {name_of_table}, choose one of {list(tables)}')
+        return store.write(tables[name_of_table],name_of_table,mode=mode)
 
     def value_to_num(self,x):
         '''Data manipulation that convert '-' to nan, convert ',' to '',
-            convert 'K' to 1000.
+            convert 'K', 'M', and 'B' to 1000, 1000000, and 1000000000.
 
         Args:
             x (optional): Selected value that want to change.
@@ -344,18 +1171,65 @@ class YFinanceScrapper():
             x (float): New value with type float.
 
         '''
-        if x == '-':
+        if type(x) == float or type(x) == int:
+            return x
+        x=x.strip().replace(',','')
+        if x in ('-',''):
             return np.nan
-        if type(x) != float or type(x)!=int:
-            if '.' not in x:
-                return int(float(x.replace(',','')))
-            elif '.' in x :
-                return float(x.replace(',',''))
-        if 'K' in x:
-            if len(x) > 1:
-                return int(float(x.replace('K',''))* 1000)
-            return 1000.0
-    
+        negative=x.startswith('(') and x.endswith(')')
+        if negative:
+            x=x[1:-1]
+        scale=SUFFIX_SCALE.get(x[-1:].upper(),1)
+        if scale != 1:
+            x=x[:-1]
+        if x == '':
+            return np.nan
+        if '.' not in x and scale == 1:
+            value=int(float(x))
+        else:
+            value=float(x)*scale
+        return -value if negative else value
+
+    def frame_to_num(self,df):
+        '''Convert all values of dataframe to float in one vectorized pass.
+
+        The cells are stacked into one Series, ',' is removed and '-' or empty
+        cells become nan with pandas string methods, then all plain numbers
+        are converted at once. Only the few cells with suffix or parentheses
+        (Ex: '1.5K' or '(7)') go through value_to_num, so the numbers are the
+        same as value_to_num on every cell.
+
+        Examples:
+            >>> bca = YFinanceScrapper('BBCA.JK')
+            >>> df = bca.frame_to_num(pd.DataFrame([['1,234','-'],['2.5K','(7)']]))
+
+        Args:
+            df (pandas.Dataframe): Dataframe with values as text.
+
+        Returns:
+            df (pandas.Dataframe): Dataframe with float64 values.
+
+        Raises:
+            ValueError: When a cell is not a number, like value_to_num.
+        '''
+        cells=pd.Series(df.to_numpy(dtype=object).ravel(),dtype=object)
+        text=cells.astype(str).str.strip().str.replace(',','',regex=False)
+        missing=(cells.isna() | text.isin(['-',''])).to_numpy()
+        special=text.str.contains(r'[KMBkmb)]$').to_numpy() & ~missing
+        plain=text.mask(missing | special)
+        try:
+            values=plain.astype('float64').to_numpy(copy=True)
+        except ValueError:
+            #pd.to_numeric find the cells that are not numbers
+            bad=plain[pd.to_numeric(plain,errors='coerce').isna() & plain.notna()]
+            raise ValueError(f'Can not convert cell {bad.iat[0]!r} to number') from None
+        for i in np.flatnonzero(special):
+            try:
+                values[i]=self.value_to_num(cells.iat[i])
+            except (ValueError,TypeError) as exc:
+                raise ValueError(f'Can not convert cell {cells.iat[i]!r} to number') from exc
+        return pd.DataFrame(values.reshape(df.shape),index=df.index,columns=df.columns)
+
     def important_dataframe(self,param1=None):
         '''Create dataframe that contain selected features from all statements table.
 
@@ -371,42 +1245,44 @@ class YFinanceScrapper():
         Returns:
             imp_dataframe (pandas.Dataframe): A pandas Dataframe that contain
                 selected features from each statement.
+
+        Raises:
+            ValueError: When a statement is not scraped yet.
         '''
-        try:
-            important_header=['time','company','current_assets','current_liabilities',
-                            'inventories','cash&cashequiv','total_assets',
-                            'total_liabilities','shareholder_equity',
-                            'operating_cashflow','gross_profit','investing_cashflow',
-                            'financing_cashflow','end_cash',
-                            'operating_income','total_revenue','net_income',
-                            'interest_expense','cost_of_good_sold','EBIT','EPS','EBITDA']
-            df=pd.DataFrame(None, columns=important_header)
-            df['time']=self.income_statement.get('Time')
-            df['company']=self.income_statement.get('Company')
-            df['current_assets']=self.balance_sheet.get('Current Assets')
-            df['current_liabilities']=self.balance_sheet.get('Current Liabilities')
-            df['inventories']=self.balance_sheet.get('Inventory')
-            df['cash&cashequiv']=self.balance_sheet.get('Cash And Cash Equivalents')
-            df['total_assets']=self.balance_sheet.get('Total Assets')
-            df['total_liabilities']=self.balance_sheet.get('Total Liabilities Net Minority Interest')
-            df['shareholder_equity']=self.balance_sheet.get("Stockholders' Equity")
-            df['operating_cashflow']=self.cash_flow.iloc[:,2]
-            df['investing_cashflow']=self.cash_flow.get('Investing Cash Flow')
-            df['financing_cashflow']=self.cash_flow.get('Financing Cash Flow')
-            df['end_cash']=self.cash_flow.get('End Cash Position')
-            df['gross_profit']=self.income_statement.get('Gross Profit')
-            df['operating_income']=self.income_statement.get('Operating Income')
-            df['total_revenue']=self.income_statement.get('Total Revenue')
-            df['interest_expense']=self.income_statement.get('Interest Expense')
-            df['net_income']=self.income_statement.get('Net Income')
-            df['cost_of_good_sold']=self.income_statement.get('Cost of Revenue')
-            df['EBIT']=self.income_statement.get('EBIT')
-            df['EPS']=self.income_statement.get('Basic EPS')
-            df['EBITDA']=self.income_statement.get('Normalized EBITDA')
-            self.imp_dataframe = df
-            return self.imp_dataframe
-        except(KeyError):
-            print('There are data that unavailable')
+        if self.income_statement is None or self.balance_sheet is None or self.cash_flow is None:
+            raise ValueError('Scrape all statements with get_alldata before important_dataframe')
+        important_header=['time','company','current_assets','current_liabilities',
+                        'inventories','cash&cashequiv','total_assets',
+                        'total_liabilities','shareholder_equity',
+                        'operating_cashflow','gross_profit','investing_cashflow',
+                        'financing_cashflow','end_cash',
+                        'operating_income','total_revenue','net_income',
+                        'interest_expense','cost_of_good_sold','EBIT','EPS','EBITDA']
+        df=pd.DataFrame(None, columns=important_header)
+        df['time']=self.income_statement.get('Time')
+        df['company']=self.income_statement.get('Company')
+        df['current_assets']=self.balance_sheet.get('Current Assets')
+        df['current_liabilities']=self.balance_sheet.get('Current Liabilities')
+        df['inventories']=self.balance_sheet.get('Inventory')
+        df['cash&cashequiv']=self.balance_sheet.get('Cash And Cash Equivalents')
+        df['total_assets']=self.balance_sheet.get('Total Assets')
+        df['total_liabilities']=self.balance_sheet.get('Total Liabilities Net Minority Interest')
+        df['shareholder_equity']=self.balance_sheet.get("Stockholders' Equity")
+        df['operating_cashflow']=self.cash_flow.iloc[:,2]
+        df['investing_cashflow']=self.cash_flow.get('Investing Cash Flow')
+        df['financing_cashflow']=self.cash_flow.get('Financing Cash Flow')
+        df['end_cash']=self.cash_flow.get('End Cash Position')
+        df['gross_profit']=self.income_statement.get('Gross Profit')
+        df['operating_income']=self.income_statement.get('Operating Income')
+        df['total_revenue']=self.income_statement.get('Total Revenue')
+        df['interest_expense']=self.income_statement.get('Interest Expense')
+        df['net_income']=self.income_statement.get('Net Income')
+        df['cost_of_good_sold']=self.income_statement.get('Cost of Revenue')
+        df['EBIT']=self.income_statement.get('EBIT')
+        df['EPS']=self.income_statement.get('Basic EPS')
+        df['EBITDA']=self.income_statement.get('Normalized EBITDA')
+        self.imp_dataframe = df
+        return self.imp_dataframe
 
     def metric_dataframe(self,param1=None):
         '''Create dataframe that contain selected financial metrics
@@ -447,4 +1323,70 @@ class YFinanceScrapper():
         df['return_on_asset_ratio']=self.imp_dataframe.get('net_income')/self.imp_dataframe.get('total_assets')
         df['return_on_equity_ratio']=self.imp_dataframe.get('net_income')/self.imp_dataframe.get('shareholder_equity')
         self.metric = df
-        return self.metric
\ No newline at end of file
+        return self.metric
+
+def compare_profiles(company_code,profiles=None,statement='Income Statement',
+        path='/usr/local/bin/chromedriver'):
+    '''Load one statement page with each browser profile and compare the timings.
+
+    Examples:
+        >>> compare_profiles('BBCA.JK')
+
+    Args:
+        company_code (str): The company code that is loaded.
+        profiles (:obj:`dict`, optional): Dictionary that contain name as key and
+            BrowserProfile as value. Defaults to None (full and lean profile).
+        statement (:obj:`str`, optional): The statement that is loaded.
+            Defaults to 'Income Statement'.
+        path (:obj:`str`, optional): Location of chromedriver.
+            Defaults to '/usr/local/bin/chromedriver'.
+
+    Returns:
+        timings (pandas.Dataframe): Dataframe with one row of page timings for
+            each profile, including total_seconds of get_html_data.
+    '''
+    if profiles is None:
+        profiles={'full':BrowserProfile.full(),'lean':BrowserProfile()}
+    rows=[]
+    for name, profile in profiles.items():
+        pool=DriverPool(path,profile=profile)
+        try:
+            scraper=YFinanceScrapper(company_code,pool=pool)
+            started=waktu.monotonic()
+            scraper.get_html_data(statement)
+            row={'profile':name,'total_seconds':waktu.monotonic()-started}
+            row.update(scraper.page_timings.get(statement,{}))
+            rows.append(row)
+        finally:
+            pool.close()
+    return pd.DataFrame(rows)
+
+def profile_ticker(company_code,sort='cumulative',limit=30,**kwargs):
+    '''Scrape all statements of one company under cProfile.
+
+    Examples:
+        >>> bca, report = profile_ticker('BBCA.JK',fetcher=HttpFetcher())
+        >>> print(report)
+        >>> print(bca.instrumentation.to_json())
+
+    Args:
+        company_code (str): The company code that is profiled.
+        sort (:obj:`str`, optional): pstats sort key. Defaults to 'cumulative'.
+        limit (:obj:`int`, optional): Number of functions in the report.
+            Defaults to 30.
+        **kwargs: Other arguments of YFinanceScrapper (Ex: pool or fetcher).
+
+    Returns:
+        scraper (YFinanceScrapper): The finished scrape session.
+        report (str): pstats text of the most expensive functions.
+    '''
+    scraper=YFinanceScrapper(company_code,**kwargs)
+    profiler=cProfile.Profile()
+    profiler.enable()
+    try:
+        scraper.get_alldata()
+    finally:
+        profiler.disable()
+    stream=io.StringIO()
+    pstats.Stats(profiler,stream=stream).sort_stats(sort).print_stats(limit)
+    return scraper, stream.getvalue()
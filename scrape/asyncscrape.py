@@ -0,0 +1,291 @@
+''' This module providing asyncio scrape session for many concurrent fetches.
+
+AsyncYFinanceScrapper is a YFinanceScrapper whose statements are
+collected from the Yahoo timeseries endpoint with one shared httpx async
+client, so Income Statement, Balance Sheet and Cash Flow of many companies
+can be waited at the same time. The number of running requests is bounded
+by a semaphore, requests to one host are spaced by HostThrottle, and failed
+requests are retried with exponential backoff.
+
+This module require httpx for async http client.
+
+'''
+
+#Import Necessary Library
+import asyncio
+import random
+import time as waktu
+from urllib.parse import urlparse
+import httpx
+from scrape.ScraFSY import YFinanceScrapper
+from scrape.fetcher import request_params, timeseries_to_table, currency_note
+
+#Status code that is worth to retry
+RETRY_STATUS=(429,500,502,503,504)
+
+#Host throttle object constructor
+class HostThrottle():
+    '''
+    A class that space out requests to the same host
+
+    Examples:
+        >>> throttle=HostThrottle(rate=5)
+        >>> await throttle.wait('https://query1.finance.yahoo.com/ws')
+
+    Args:
+        rate (:obj:`float`, optional): Maximum requests per second to one
+            host. None or 0 means no limit. Defaults to 5.
+
+    Attributes:
+        interval (float): Minimum seconds between two requests to one host.
+        next_time (dict): Dictionary that contain host as key and earliest
+            time of the next request as value.
+    '''
+    #Function for initialization of object
+    def __init__(self,rate=5):
+        self.interval=1/rate if rate else 0
+        self.next_time={}
+
+    async def wait(self,url):
+        '''Wait until the next request to the host of url is allowed.
+
+        Args:
+            url (str): Address of the request.
+        '''
+        host=urlparse(url).netloc
+        now=waktu.monotonic()
+        start=max(self.next_time.get(host,0),now)
+        self.next_time[host]=start+self.interval
+        if start > now:
+            await asyncio.sleep(start-now)
+
+#Async scrape session object constructor
+class AsyncYFinanceScrapper(YFinanceScrapper):
+    '''
+    A class that represent one async scrape session
+
+    Examples:
+        >>> bca=AsyncYFinanceScrapper('BBCA.JK')
+        >>> await bca.get_alldata()
+
+    Args:
+        company_code (str): The company code that you want to scrape.
+        client (:obj:`httpx.AsyncClient`, optional): Shared async client.
+            Defaults to None (a client is made for each call).
+        semaphore (:obj:`asyncio.Semaphore`, optional): Shared limit of running
+            requests. Defaults to None.
+        throttle (:obj:`HostThrottle`, optional): Shared per-host throttle.
+            Defaults to None.
+        base_url (:obj:`str`, optional): Address of the endpoint host.
+            Defaults to 'https://query1.finance.yahoo.com'.
+        retries (:obj:`int`, optional): Number of retries of a failed request.
+            Defaults to 3.
+        backoff (:obj:`float`, optional): Seconds before the first retry, it
+            is doubled for each retry. Defaults to 0.5.
+        instrumentation (:obj:`ScrapeMetrics`, optional): Stage timers and counters
+            that can be shared between sessions. Defaults to None (a new one).
+
+    Attributes:
+        backoff (float): Seconds before the first retry.
+        base_url (str): Address of the endpoint host.
+        client (httpx.AsyncClient): Shared async client.
+        retries (int): Number of retries of a failed request.
+        semaphore (asyncio.Semaphore): Shared limit of running requests.
+        throttle (HostThrottle): Shared per-host throttle.
+    '''
+    #Function for initialization of object
+    def __init__(self,company_code,client=None,semaphore=None,throttle=None,
+            base_url='https://query1.finance.yahoo.com',retries=3,backoff=0.5,instrumentation=None):
+        super().__init__(company_code,instrumentation=instrumentation)
+        self.client=client
+        self.semaphore=semaphore
+        self.throttle=throttle
+        self.base_url=base_url
+        self.retries=retries
+        self.backoff=backoff
+
+    async def fetch_payload(self,client,statement):
+        '''Retrieve timeseries JSON of one statement with retries.
+
+        Args:
+            client (httpx.AsyncClient): Async client that send the request.
+            statement (str): The selected statement that is gonna be scraped.
+
+        Returns:
+            payload (dict): JSON from fundamentals timeseries endpoint.
+        '''
+        url, params=request_params(self.base_url,self.company_code,statement)
+        attempt=0
+        while True:
+            try:
+                if self.throttle is not None:
+                    await self.throttle.wait(url)
+                started=waktu.perf_counter()
+                if self.semaphore is not None:
+                    async with self.semaphore:
+                        response=await client.get(url,params=params)
+                else:
+                    response=await client.get(url,params=params)
+                self.instrumentation.record('fetch',waktu.perf_counter()-started)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code not in RETRY_STATUS or attempt >= self.retries:
+                    self.instrumentation.count('failures')
+                    raise
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    self.instrumentation.count('failures')
+                    raise
+            #Wait before retry, longer for each attempt
+            self.instrumentation.count('retries')
+            await asyncio.sleep(self.backoff*2**attempt*(1+random.random()))
+            attempt += 1
+
+    def build_dataframe(self,payload,statement):
+        '''Create dataframe of one statement from timeseries JSON.
+
+        Args:
+            payload (dict): JSON from fundamentals timeseries endpoint.
+            statement (str): The selected statement that is gonna be scraped.
+
+        Returns:
+            df (pandas.Dataframe): Dataframe that contain data from selected statement.
+        '''
+        self.reset_data()
+        with self.instrumentation.stage('parse'):
+            features, self.collect, self.headers, self.time=timeseries_to_table(payload,statement)
+        self.features.extend(features)
+        self.note.extend(noted for noted in currency_note(payload) if noted not in self.note)
+        with self.instrumentation.stage('dataframe'):
+            df=self.create_dataframe(
+                collect=self.collect,headers=self.headers,time=self.time,statement=statement)
+        if statement=='Income Statement':
+            self.income_statement=df
+        elif statement=='Balance Sheet':
+            self.balance_sheet=df
+        elif statement=='Cash Flow':
+            self.cash_flow=df
+        self.reset_data()
+        return df
+
+    async def get_finance_data(self,statement):
+        '''Retrieve dataframe that contains all data in selected statement.
+
+        Examples:
+            >>> bca = AsyncYFinanceScrapper('BBCA.JK')
+            >>> df = await bca.get_finance_data('Income Statement')
+
+        Args:
+            statement (str): The selected statement that is gonna be scraped.
+
+        Returns:
+            df (pandas.Dataframe): Dataframe that contain data from selected statement.
+        '''
+        if self.client is not None:
+            payload=await self.fetch_payload(self.client,statement)
+        else:
+            async with httpx.AsyncClient(headers={'User-Agent':'Mozilla/5.0'}) as client:
+                payload=await self.fetch_payload(client,statement)
+        return self.build_dataframe(payload,statement)
+
+    async def fetch_statements(self,client):
+        '''Retrieve timeseries JSON of all statements at the same time.
+
+        When one statement fail, the other requests are cancelled before the
+        error is raised, so they do not keep the semaphore, the throttle, or
+        the client.
+
+        Args:
+            client (httpx.AsyncClient): Async client that send the requests.
+
+        Returns:
+            payloads (list): JSON of each statement in table_choice.
+        '''
+        tasks=[asyncio.ensure_future(self.fetch_payload(client,statement))
+            for statement in self.table_choice]
+        try:
+            await asyncio.wait(tasks,return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks,return_exceptions=True)
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        return [task.result() for task in tasks]
+
+    async def get_alldata(self,param1=None):
+        '''Retrieve all statement in 3 dataframe of selected company concurrently.
+
+        Examples:
+            >>> bca = AsyncYFinanceScrapper('BBCA.JK')
+            >>> await bca.get_alldata()
+
+        Args:
+            param1 (:obj:`str`, optional): The first parameter.
+                Defaults to None.
+
+        Returns:
+            balance_sheet (pandas.Dataframe): A pandas Dataframe that contain
+                balance sheet statement data.
+            cash_flow (pandas.Dataframe): A pandas Dataframe that contain
+                cash flow statement data.
+            income_statement (pandas.Dataframe): A pandas Dataframe that contain
+                income statement data.
+        '''
+        if self.client is not None:
+            payloads=await self.fetch_statements(self.client)
+        else:
+            async with httpx.AsyncClient(headers={'User-Agent':'Mozilla/5.0'}) as client:
+                payloads=await self.fetch_statements(client)
+        #Build dataframe one by one because features, collect, and headers are shared
+        for payload, statement in zip(payloads,self.table_choice):
+            self.build_dataframe(payload,statement)
+
+async def scrape_all(codes,concurrency=10,rate=5,base_url='https://query1.finance.yahoo.com',
+        retries=3,backoff=0.5,instrumentation=None):
+    '''Scrape all statements of many companies concurrently.
+
+    Examples:
+        >>> sessions, failures = asyncio.run(scrape_all(['BBCA.JK','BMRI.JK']))
+
+    Args:
+        codes (list): List of company code that you want to scrape, a
+            repeated code is scraped once.
+        concurrency (:obj:`int`, optional): Maximum number of running requests.
+            Defaults to 10.
+        rate (:obj:`float`, optional): Maximum requests per second to one host.
+            Defaults to 5.
+        base_url (:obj:`str`, optional): Address of the endpoint host.
+            Defaults to 'https://query1.finance.yahoo.com'.
+        retries (:obj:`int`, optional): Number of retries of a failed request.
+            Defaults to 3.
+        backoff (:obj:`float`, optional): Seconds before the first retry.
+            Defaults to 0.5.
+        instrumentation (:obj:`ScrapeMetrics`, optional): Timers and counters that are
+            shared by all sessions. Defaults to None (one for each session).
+
+    Returns:
+        sessions (dict): Dictionary that contain company code as key and
+            finished AsyncYFinanceScrapper as value.
+        failures (dict): Dictionary that contain company code as key and
+            the error as value.
+    '''
+    #Scrape each company once, a repeated code would misalign the results
+    codes=list(dict.fromkeys(codes))
+    semaphore=asyncio.Semaphore(concurrency)
+    throttle=HostThrottle(rate)
+    limits=httpx.Limits(max_connections=concurrency,max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(headers={'User-Agent':'Mozilla/5.0'},limits=limits) as client:
+        sessions={code:AsyncYFinanceScrapper(code,client=client,semaphore=semaphore,
+            throttle=throttle,base_url=base_url,retries=retries,backoff=backoff,
+            instrumentation=instrumentation) for code in codes}
+        results=await asyncio.gather(
+            *[session.get_alldata() for session in sessions.values()],return_exceptions=True)
+    failures={}
+    for code, result in zip(codes,results):
+        if isinstance(result,Exception):
+            failures[code]=result
+            del sessions[code]
+    return sessions, failures
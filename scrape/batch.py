@@ -0,0 +1,267 @@
+''' This module providing function to scrape many companies in one run.
+
+Every company is scraped in its own YFinanceScrapper session, so the
+sessions do not share any mutable state. The sessions are run across a
+thread pool, each worker thread owns one browser that is reused for all of
+its companies, and the page loads of all workers are limited by one shared
+rate limiter.
+
+iter_statements yield every (company, statement, dataframe) as soon as it
+is parsed. The workers put their results in a bounded queue, so a slow
+consumer make the workers wait (backpressure) and only a few dataframes are
+held in memory. scrape_universe collect the stream into one long-format
+dataframe that contain every collected value with its company, statement,
+time and line item, together with one dataframe that report the failed
+company and statement.
+
+'''
+
+#Import Necessary Library
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+import time as waktu
+import pandas as pd
+from scrape.ScraFSY import YFinanceScrapper, DriverPool, ScrapeError, error_text
+
+#Rate limiter object constructor
+class RateLimiter():
+    '''
+    A class that limit the number of page loads per second
+
+    Examples:
+        >>> limiter=RateLimiter(rate=0.5)
+        >>> limiter.wait()
+
+    Args:
+        rate (:obj:`float`, optional): Maximum page loads per second.
+            None or 0 means no limit. Defaults to 1.0.
+
+    Attributes:
+        interval (float): Minimum seconds between two page loads.
+        next_time (float): Earliest monotonic time of the next page load.
+    '''
+    #Function for initialization of object
+    def __init__(self,rate=1.0):
+        self.interval=1/rate if rate else 0
+        self.next_time=0
+        self.lock=threading.Lock()
+
+    def wait(self):
+        '''Block until the next page load is allowed.'''
+        with self.lock:
+            now=waktu.monotonic()
+            start=max(self.next_time,now)
+            self.next_time=start+self.interval
+        if start > now:
+            waktu.sleep(start-now)
+
+def to_long_format(df,statement):
+    '''Convert one statement dataframe to long format.
+
+    Examples:
+        >>> bca = YFinanceScrapper('BBCA.JK')
+        >>> long = to_long_format(bca.get_finance_data('Income Statement'),'Income Statement')
+
+    Args:
+        df (pandas.Dataframe): Dataframe from create_dataframe.
+        statement (str): The statement of the dataframe.
+
+    Returns:
+        long (pandas.Dataframe): Dataframe with columns Company, Statement,
+            Time, Item, and Value.
+    '''
+    long=df.melt(id_vars=['Company','Time'],var_name='Item',value_name='Value')
+    long.insert(1,'Statement',statement)
+    return long
+
+def iter_company(scraper,statements,limiter=None):
+    '''Scrape selected statements of one company one by one.
+
+    Examples:
+        >>> bca = YFinanceScrapper('BBCA.JK',pool=DriverPool())
+        >>> for company, statement, df, error in iter_company(bca,['Income Statement']):
+        ...     print(statement,error)
+
+    Args:
+        scraper (YFinanceScrapper): Scrape session of the company.
+        statements (list): List of statement that is scraped.
+        limiter (:obj:`RateLimiter`, optional): Rate limiter of page loads.
+            Defaults to None.
+
+    Yields:
+        company_code (str): The company code.
+        statement (str): The statement.
+        df (pandas.Dataframe): Dataframe from create_dataframe, None when
+            the statement failed.
+        error (Exception): The error of the failed statement, None when it
+            is scraped.
+    '''
+    for statement in statements:
+        if limiter is not None:
+            with scraper.instrumentation.stage('limiter'):
+                limiter.wait()
+        try:
+            df=scraper.get_finance_data(statement=statement)
+            error=None
+            if df is None:
+                error=ScrapeError('No data is returned',scraper.company_code,statement)
+        except Exception as exc:
+            df=None
+            error=exc
+        scraper.reset_data()
+        yield scraper.company_code, statement, df, error
+
+def iter_statements(codes,statements=None,workers=4,rate=1.0,
+        path='/usr/local/bin/chromedriver',max_pages=50,buffer=8,on_error='skip',
+        fetcher=None,cache=None,instrumentation=None):
+    '''Scrape many companies and yield every statement as soon as it is parsed.
+
+    Each worker thread own one browser like scrape_universe. The results go
+    through a queue that hold at most buffer records, so the workers wait
+    while the consumer is busy. When the loop is left early (break, error,
+    or on_error='raise'), no new page is loaded and the browsers are closed.
+
+    Examples:
+        >>> from scrape.fetcher import STATEMENT_FILES
+        >>> store=StatementStore('parquet_files')
+        >>> for company, statement, df in iter_statements(['BBCA.JK','BMRI.JK']):
+        ...     store.write(df,STATEMENT_FILES[statement])
+
+    Args:
+        codes (list): List of company code that you want to scrape.
+        statements (:obj:`list`, optional): List of statement that is scraped.
+            Defaults to None (all statements).
+        workers (:obj:`int`, optional): Number of worker threads, each worker
+            own one browser. Defaults to 4.
+        rate (:obj:`float`, optional): Maximum page loads per second of all
+            workers. Defaults to 1.0.
+        path (:obj:`str`, optional): Location of chromedriver.
+            Defaults to '/usr/local/bin/chromedriver'.
+        max_pages (:obj:`int`, optional): Number of pages that one browser
+            can load before it is recycled. Defaults to 50.
+        buffer (:obj:`int`, optional): Maximum number of finished records that
+            wait for the consumer. Defaults to 8.
+        on_error (:obj:`str`, optional): 'skip' leave out failed statements,
+            'raise' raise the first error and stop, and 'yield' yield the
+            error in place of the dataframe. Defaults to 'skip'.
+        fetcher (:obj:`fetcher.BaseFetcher`, optional): Fetcher without browser.
+            Defaults to None.
+        cache (:obj:`cache.ResponseCache`, optional): On-disk response cache.
+            Defaults to None.
+        instrumentation (:obj:`ScrapeMetrics`, optional): Timers and counters that are
+            shared by all workers. Defaults to None (one for each company).
+
+    Yields:
+        company_code (str): The company code.
+        statement (str): The statement.
+        df (pandas.Dataframe): Dataframe from create_dataframe, or the error
+            when on_error is 'yield' and the statement failed.
+    '''
+    if on_error not in ('skip','raise','yield'):
+        raise ValueError("on_error must be 'skip', 'raise', or 'yield'")
+    if statements is None:
+        statements=['Income Statement','Balance Sheet','Cash Flow']
+    limiter=RateLimiter(rate)
+    results=queue.Queue(maxsize=buffer)
+    stop=threading.Event()
+    finished=object()
+    local=threading.local()
+    pools=[]
+    pools_lock=threading.Lock()
+
+    def put(record):
+        #Wait while the queue is full, give up when the consumer has stopped
+        while not stop.is_set():
+            try:
+                results.put(record,timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def work(company_code):
+        #Each worker thread own one browser
+        if not hasattr(local,'pool'):
+            local.pool=DriverPool(path,size=1,max_pages=max_pages)
+            with pools_lock:
+                pools.append(local.pool)
+        if stop.is_set():
+            return
+        scraper=YFinanceScrapper(company_code,pool=local.pool,fetcher=fetcher,
+            cache=cache,instrumentation=instrumentation)
+        #The next statement is only scraped after the record is taken
+        for record in iter_company(scraper,statements,limiter):
+            if not put(record):
+                return
+
+    def run():
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(work,codes):
+                    pass
+        except Exception as exc:
+            put((None,None,None,exc))
+        finally:
+            for pool in pools:
+                pool.close()
+            put(finished)
+
+    producer=threading.Thread(target=run,daemon=True)
+    producer.start()
+    try:
+        while True:
+            record=results.get()
+            if record is finished:
+                break
+            company_code, statement, df, error=record
+            if error is None:
+                yield company_code, statement, df
+            elif on_error == 'raise' or company_code is None:
+                raise error
+            elif on_error == 'yield':
+                yield company_code, statement, error
+    finally:
+        stop.set()
+        producer.join()
+
+def scrape_universe(codes,statements=None,workers=4,rate=1.0,
+        path='/usr/local/bin/chromedriver',max_pages=50,instrumentation=None):
+    '''Scrape selected statements of many companies concurrently.
+
+    Examples:
+        >>> data, failures = scrape_universe(['BBCA.JK','BMRI.JK'],workers=2)
+
+    Args:
+        codes (list): List of company code that you want to scrape.
+        statements (:obj:`list`, optional): List of statement that is scraped.
+            Defaults to None (all statements).
+        workers (:obj:`int`, optional): Number of worker threads, each worker
+            own one browser. Defaults to 4.
+        rate (:obj:`float`, optional): Maximum page loads per second of all
+            workers. Defaults to 1.0.
+        path (:obj:`str`, optional): Location of chromedriver.
+            Defaults to '/usr/local/bin/chromedriver'.
+        max_pages (:obj:`int`, optional): Number of pages that one browser
+            can load before it is recycled. Defaults to 50.
+        instrumentation (:obj:`ScrapeMetrics`, optional): Timers and counters that are
+            shared by all workers. Defaults to None (one for each company).
+
+    Returns:
+        data (pandas.Dataframe): Long-format dataframe with columns Company,
+            Statement, Time, Item, and Value.
+        failures (pandas.Dataframe): Dataframe with columns Company, Statement,
+            and Error of every failed statement.
+    '''
+    frames=[]
+    failures=[]
+    for company_code, statement, df in iter_statements(codes,statements,workers,rate,
+            path,max_pages,on_error='yield',instrumentation=instrumentation):
+        if isinstance(df,Exception):
+            failures.append((company_code,statement,error_text(df)))
+        else:
+            frames.append(to_long_format(df,statement))
+    columns=['Company','Statement','Time','Item','Value']
+    data=pd.concat(frames,ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    failures=pd.DataFrame(failures,columns=['Company','Statement','Error'])
+    return data, failures
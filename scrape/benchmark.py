@@ -0,0 +1,545 @@
+''' This module providing offline benchmarks of the scrape session.
+
+The benchmarks run on HTML that is saved from Yahoo Finance, or on
+synthetic HTML that copy the markup of Yahoo Finance financial statement
+table, so no browser or internet is needed. record_html save real pages
+in scrape/fixtures, and when there are no saved pages the synthetic pages
+of make_statement_html are used. The repository has no recorded pages yet,
+so the numbers are from synthetic pages until some are recorded.
+
+Every stage (parse_data, create_dataframe, value_to_num, frame_to_num,
+important_dataframe, metric_dataframe, and compute_metrics) is measured on
+the snapshots and on scaled-up tables with many quarters and many
+companies. The report give rows/sec and peak memory of each stage, and
+--json save it together with the library versions, so the numbers can be
+compared across versions.
+
+Run it from the repository root:
+
+    python -m scrape.benchmark
+    python -m scrape.benchmark saved/BBCA.JK_income_statement.html
+    python -m scrape.benchmark --companies 1000 --quarters 80
+    python -m scrape.benchmark --json bench.json
+
+The same stages are pytest benchmarks in tests/test_benchmark.py, which
+check the report fields and that lxml and frame_to_num stay faster:
+
+    python -m pytest -m bench
+
+'''
+
+#Import Necessary Library
+from datetime import date
+import argparse
+import json
+import os
+import platform
+import random
+import time as waktu
+import tracemalloc
+import numpy as np
+import pandas as pd
+from scrape.ScraFSY import YFinanceScrapper
+from scrape.fetcher import STATEMENT_ITEMS, STATEMENT_FILES
+from scrape.metrics import stack_statements, compute_metrics
+
+#Directory of the HTML snapshots
+FIXTURE_DIR=os.path.join(os.path.dirname(os.path.abspath(__file__)),'fixtures')
+
+#Class of value cell in Yahoo table
+CELL_CLASS='Ta(c) Py(6px) Bxz(bb) BdB Bdc($seperatorColor) Miw(120px) Miw(100px)--pnclg D(tbc)'
+
+def quarter_ends(quarters,last=date(2022,12,31)):
+    '''Create list of quarter end dates, newest first.
+
+    Args:
+        quarters (int): Number of quarters.
+        last (:obj:`datetime.date`, optional): Newest quarter end.
+            Defaults to 2022-12-31.
+
+    Returns:
+        dates (list): List of date text in Yahoo format (M/D/YYYY).
+    '''
+    ends={3:31,6:30,9:30,12:31}
+    dates=[]
+    year, month=last.year, last.month
+    for i in range(quarters):
+        dates.append(f'{month}/{ends[month]}/{year}')
+        month -= 3
+        if month == 0:
+            month, year=12, year-1
+    return dates
+
+def make_statement_html(statement,quarters=8,extra_rows=0,page_noise=2000,seed=0):
+    '''Create synthetic HTML with the markup of Yahoo financial statement page.
+
+    Examples:
+        >>> html = make_statement_html('Income Statement',quarters=12)
+
+    Args:
+        statement (str): The statement of the table.
+        quarters (:obj:`int`, optional): Number of quarter columns. Defaults to 8.
+        extra_rows (:obj:`int`, optional): Number of additional line items.
+            Defaults to 0.
+        page_noise (:obj:`int`, optional): Number of unrelated elements around
+            the table, like the rest of Yahoo page. Defaults to 2000.
+        seed (:obj:`int`, optional): Seed of the random values. Defaults to 0.
+
+    Returns:
+        html (str): HTML of the page body.
+    '''
+    rng=random.Random(seed)
+    headers=['Breakdown']
+    if statement != 'Balance Sheet':
+        headers.append('ttm')
+    headers += quarter_ends(quarters)
+    labels=[label for key, label in STATEMENT_ITEMS[statement]]
+    labels += [f'Other Item {i}' for i in range(extra_rows)]
+    parts=['<div id="YDC-Lead"><nav>']
+    parts += [f'<div class="Mx(10px)"><a href="#n{i}"><span>Menu {i}</span></a></div>'
+        for i in range(page_noise//2)]
+    parts.append('</nav></div><div id="Col1-1-Financials-Proxy"><section>')
+    parts.append('<div class="Mb(10px)"><span class="Fz(xs) C($tertiaryColor) Mstart(25px)">'
+        'Currency in IDR. All numbers in thousands</span></div>')
+    parts.append('<div class="W(100%) Whs(nw) Ovx(a) BdT Bdtc($seperatorColor)">'
+        '<div class="D(tbl) Whs(nw) Ovx(a) BdB Bdc($seperatorColor)">')
+    parts.append('<div class="D(tbhg)"><div class="D(tbr) C($primaryColor)">')
+    for header in headers:
+        parts.append(f'<div class="{CELL_CLASS} Fw(b)"><span>{header}</span></div>')
+    parts.append('</div></div><div class="D(tbrg)">')
+    for label in labels:
+        parts.append('<div data-test="fin-row"><div class="D(tbr) fi-row Bgc($hoverBgColor):h">'
+            '<div class="D(tbc) Ta(start) Pend(10px) Pos(st) Start(0)">'
+            f'<div class="D(ib) Va(m) Ell Mt(-3px) W(200px)" title="{label}">'
+            f'<button class="P(0) M(0) Va(m)"><svg></svg></button><span class="Va(m)">{label}</span></div>'
+            '<div class="W(3px) Pos(a) Start(100%) T(0) H(100%)"></div></div>')
+        for column in headers[1:]:
+            draw=rng.random()
+            if draw < 0.05:
+                value='-'
+            elif label.endswith('EPS'):
+                value=f'{rng.uniform(-50,500):,.2f}'
+            else:
+                value=f'{int(rng.uniform(-1e6,9e9)):,}'
+            parts.append(f'<div class="{CELL_CLASS}" data-test="fin-col"><span>{value}</span></div>')
+        parts.append('</div></div>')
+    parts.append('</div></div></div></section></div><div id="YDC-Col2">')
+    parts += [f'<div class="Py(10px)"><p class="Fz(s)">News {i}</p></div>'
+        for i in range(page_noise//2)]
+    parts.append('</div>')
+    return ''.join(parts)
+
+def best_time(function,repeat=5):
+    '''Run a function several times and return the fastest time.
+
+    Args:
+        function (callable): Function without argument.
+        repeat (:obj:`int`, optional): Number of runs. Defaults to 5.
+
+    Returns:
+        seconds (float): Fastest run time in seconds.
+        result: Return value of the last run.
+    '''
+    best=float('inf')
+    result=None
+    for i in range(repeat):
+        start=waktu.perf_counter()
+        result=function()
+        best=min(best,waktu.perf_counter()-start)
+    return best, result
+
+def measure(function,repeat=5):
+    '''Measure the fastest time and the peak memory of a function.
+
+    The peak memory is measured in one extra run with tracemalloc, so the
+    tracing does not slow down the timed runs.
+
+    Args:
+        function (callable): Function without argument.
+        repeat (:obj:`int`, optional): Number of timed runs. Defaults to 5.
+
+    Returns:
+        seconds (float): Fastest run time in seconds.
+        peak (int): Peak bytes allocated during one run.
+        result: Return value of the last run.
+    '''
+    seconds, result=best_time(function,repeat)
+    tracemalloc.start()
+    try:
+        function()
+        peak=tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, result
+
+def stage_result(stage,case,rows,seconds,peak):
+    '''Create one row of the stage report.
+
+    Args:
+        stage (str): Name of the measured stage.
+        case (str): Name of the input.
+        rows (int): Number of rows that the stage handle.
+        seconds (float): Fastest run time in seconds.
+        peak (int): Peak bytes of one run.
+
+    Returns:
+        result (dict): stage, case, rows, seconds, rows_per_sec, and peak_mb.
+    '''
+    return {
+        'stage':stage,
+        'case':case,
+        'rows':rows,
+        'seconds':seconds,
+        'rows_per_sec':rows/seconds if seconds else float('inf'),
+        'peak_mb':peak/2**20,
+    }
+
+def fixture_path(company_code,statement,directory=FIXTURE_DIR):
+    '''Location of the HTML snapshot of one company and statement.
+
+    Args:
+        company_code (str): The company code of the snapshot.
+        statement (str): The statement of the snapshot.
+        directory (:obj:`str`, optional): Directory of the snapshots.
+            Defaults to scrape/fixtures.
+
+    Returns:
+        path (str): Location of the HTML file.
+    '''
+    return os.path.join(directory,f'{company_code}_{STATEMENT_FILES[statement]}.html')
+
+def write_fixtures(directory=FIXTURE_DIR,company_code='SAMPLE',quarters=12):
+    '''Write synthetic HTML snapshots of the three statements.
+
+    Examples:
+        >>> write_fixtures()
+
+    Args:
+        directory (:obj:`str`, optional): Directory of the snapshots.
+            Defaults to scrape/fixtures.
+        company_code (:obj:`str`, optional): Company code in the file names.
+            Defaults to 'SAMPLE'.
+        quarters (:obj:`int`, optional): Number of quarter columns.
+            Defaults to 12.
+
+    Returns:
+        paths (list): Locations of the written files.
+    '''
+    os.makedirs(directory,exist_ok=True)
+    paths=[]
+    for seed, statement in enumerate(STATEMENT_ITEMS):
+        path=fixture_path(company_code,statement,directory)
+        with open(path,'w') as file:
+            file.write(make_statement_html(statement,quarters=quarters,seed=seed))
+        paths.append(path)
+    return paths
+
+def record_html(scraper,statement,directory=FIXTURE_DIR):
+    '''Save the HTML of one statement page from Yahoo Finance as snapshot.
+
+    This need chromedriver and internet, the saved file is then used offline.
+
+    Examples:
+        >>> record_html(YFinanceScrapper('BBCA.JK'),'Balance Sheet')
+
+    Args:
+        scraper (YFinanceScrapper): Scrape session of the company.
+        statement (str): The statement that is saved.
+        directory (:obj:`str`, optional): Directory of the snapshots.
+            Defaults to scrape/fixtures.
+
+    Returns:
+        path (str): Location of the written file.
+    '''
+    parser=scraper.parser
+    scraper.parser='lxml'
+    try:
+        html=scraper.get_html_data(statement)
+    finally:
+        scraper.parser=parser
+    os.makedirs(directory,exist_ok=True)
+    path=fixture_path(scraper.company_code,statement,directory)
+    with open(path,'w') as file:
+        file.write(html)
+    return path
+
+def load_fixtures(directory=FIXTURE_DIR):
+    '''Read the HTML snapshots of a directory.
+
+    Args:
+        directory (:obj:`str`, optional): Directory of the snapshots.
+            Defaults to scrape/fixtures.
+
+    Returns:
+        cases (list): List of (name, statement, html) of every snapshot.
+    '''
+    cases=[]
+    if not os.path.isdir(directory):
+        return cases
+    for name in sorted(os.listdir(directory)):
+        statement=statement_of_file(name)
+        if name.endswith('.html') and statement is not None:
+            with open(os.path.join(directory,name)) as file:
+                cases.append((name,statement,file.read()))
+    return cases
+
+def parse_with(parser,html,statement):
+    '''Parse HTML like get_html_data and parse_data do with selected parser.
+
+    Args:
+        parser (str): 'bs4' or 'lxml'.
+        html (str): HTML of Yahoo Finance page.
+        statement (str): The statement of the table.
+
+    Returns:
+        parsed (tuple): collect, headers, time, features, and note.
+    '''
+    scraper=YFinanceScrapper('BENCH')
+    scraper.parser=parser
+    collect, headers, time=scraper.parse_data(scraper.make_content(html),statement)
+    return collect, headers, time, scraper.features, scraper.note
+
+def bench_parse(html,statement,repeat=5):
+    '''Compare BeautifulSoup and lxml parser on one HTML.
+
+    Examples:
+        >>> bench_parse(make_statement_html('Balance Sheet'),'Balance Sheet')
+
+    Args:
+        html (str): HTML of Yahoo Finance page.
+        statement (str): The statement of the table.
+        repeat (:obj:`int`, optional): Number of runs. Defaults to 5.
+
+    Returns:
+        result (dict): Seconds of each parser, speedup, and whether both
+            parsers give the same output.
+    '''
+    bs4_time, bs4_result=best_time(lambda: parse_with('bs4',html,statement),repeat)
+    lxml_time, lxml_result=best_time(lambda: parse_with('lxml',html,statement),repeat)
+    return {
+        'bs4':bs4_time,
+        'lxml':lxml_time,
+        'speedup':bs4_time/lxml_time,
+        'same':bs4_result == lxml_result,
+    }
+
+def make_value_frame(companies=100,quarters=12,items=100,seed=0):
+    '''Create wide dataframe of value text like the transposed Yahoo tables.
+
+    Examples:
+        >>> df = make_value_frame(companies=500)
+
+    Args:
+        companies (:obj:`int`, optional): Number of companies. Defaults to 100.
+        quarters (:obj:`int`, optional): Number of quarters of each company.
+            Defaults to 12.
+        items (:obj:`int`, optional): Number of line items. Defaults to 100.
+        seed (:obj:`int`, optional): Seed of the random values. Defaults to 0.
+
+    Returns:
+        df (pandas.Dataframe): Dataframe with companies*quarters rows and
+            items columns of value text.
+    '''
+    rng=np.random.default_rng(seed)
+    numbers=rng.uniform(-1e6,9e9,size=(companies*quarters,items)).astype('int64')
+    text=np.char.mod('%d',numbers).astype(object)
+    #Add thousands separator, missing values, and suffixes
+    text=pd.DataFrame(text).map(lambda x: f'{int(x):,}').to_numpy()
+    draw=rng.random(size=text.shape)
+    text[draw < 0.05]='-'
+    text[(draw >= 0.05) & (draw < 0.07)]='1.5K'
+    return pd.DataFrame(text,columns=[f'Item {i}' for i in range(items)])
+
+def bench_convert(df,repeat=3):
+    '''Compare per-cell value_to_num and vectorized frame_to_num.
+
+    Examples:
+        >>> bench_convert(make_value_frame())
+
+    Args:
+        df (pandas.Dataframe): Dataframe with values as text.
+        repeat (:obj:`int`, optional): Number of runs. Defaults to 3.
+
+    Returns:
+        result (dict): Seconds of each conversion, speedup, cells per second
+            of frame_to_num, and whether both give the same numbers.
+    '''
+    scraper=YFinanceScrapper('BENCH')
+    #DataFrame.applymap is renamed to DataFrame.map in new pandas
+    per_cell=df.map if hasattr(df,'map') else df.applymap
+    cell_time, cell_result=best_time(lambda: per_cell(scraper.value_to_num),repeat)
+    frame_time, frame_result=best_time(lambda: scraper.frame_to_num(df),repeat)
+    same=np.allclose(cell_result.to_numpy(dtype='float64'),frame_result.to_numpy(),equal_nan=True)
+    return {
+        'value_to_num':cell_time,
+        'frame_to_num':frame_time,
+        'speedup':cell_time/frame_time,
+        'cells_per_sec':df.size/frame_time,
+        'same':same,
+    }
+
+def scrape_html(company_code,pages):
+    '''Create the three statement dataframes of one company from HTML.
+
+    Args:
+        company_code (str): The company code of the session.
+        pages (dict): Dictionary that contain statement as key and HTML as value.
+
+    Returns:
+        scraper (YFinanceScrapper): Session with income_statement,
+            balance_sheet, and cash_flow.
+    '''
+    scraper=YFinanceScrapper(company_code)
+    scraper.parser='lxml'
+    for statement, html in pages.items():
+        scraper.reset_data()
+        collect, headers, time=scraper.parse_data(html,statement)
+        df=scraper.create_dataframe(collect,headers,time,statement)
+        if statement == 'Income Statement':
+            scraper.income_statement=df
+        elif statement == 'Balance Sheet':
+            scraper.balance_sheet=df
+        elif statement == 'Cash Flow':
+            scraper.cash_flow=df
+    scraper.reset_data()
+    return scraper
+
+def bench_stages(cases,quarters=40,companies=100,repeat=5):
+    '''Measure rows/sec and peak memory of every stage.
+
+    Examples:
+        >>> report = bench_stages(load_fixtures())
+
+    Args:
+        cases (list): List of (name, statement, html) of the snapshots.
+        quarters (:obj:`int`, optional): Number of quarters of the scaled-up
+            tables. Defaults to 40.
+        companies (:obj:`int`, optional): Number of companies of the scaled-up
+            panel and value frame. Defaults to 100.
+        repeat (:obj:`int`, optional): Number of timed runs. Defaults to 5.
+
+    Returns:
+        report (pandas.Dataframe): Dataframe with columns stage, case, rows,
+            seconds, rows_per_sec, and peak_mb.
+    '''
+    results=[]
+    scaled=[(f'synthetic {statement} x{quarters}q',statement,
+        make_statement_html(statement,quarters=quarters,seed=seed))
+        for seed, statement in enumerate(STATEMENT_ITEMS)]
+    for name, statement, html in list(cases)+scaled:
+        for parser in ('bs4','lxml'):
+            seconds, peak, parsed=measure(lambda: parse_with(parser,html,statement),repeat)
+            results.append(stage_result(f'parse_data ({parser})',name,len(parsed[0]),seconds,peak))
+        collect, headers, time, features, note=parsed
+        scraper=YFinanceScrapper('BENCH')
+
+        def create():
+            scraper.features=list(features)
+            return scraper.create_dataframe(collect,headers,time,statement)
+        seconds, peak, df=measure(create,repeat)
+        results.append(stage_result('create_dataframe',name,len(df),seconds,peak))
+    #Value conversion of a wide frame of many companies
+    df=make_value_frame(companies=companies)
+    scraper=YFinanceScrapper('BENCH')
+    per_cell=df.map if hasattr(df,'map') else df.applymap
+    seconds, peak, result=measure(lambda: per_cell(scraper.value_to_num),max(repeat//2,1))
+    results.append(stage_result('value_to_num',f'{companies} companies',len(df),seconds,peak))
+    seconds, peak, result=measure(lambda: scraper.frame_to_num(df),repeat)
+    results.append(stage_result('frame_to_num',f'{companies} companies',len(df),seconds,peak))
+    #Feature and metric dataframe of one company, from snapshots and scaled tables
+    sessions=[]
+    for name, pages in (('snapshots',{statement:html for name, statement, html in cases}),
+            (f'x{quarters}q',{statement:html for name, statement, html in scaled})):
+        if len(pages) < len(STATEMENT_ITEMS):
+            continue
+        session=scrape_html('BENCH',pages)
+        sessions.append((name,session))
+        seconds, peak, imp=measure(session.important_dataframe,repeat)
+        results.append(stage_result('important_dataframe',name,len(imp),seconds,peak))
+        seconds, peak, metric=measure(session.metric_dataframe,repeat)
+        results.append(stage_result('metric_dataframe',name,len(metric),seconds,peak))
+    #Metric engine on a panel of many companies
+    if sessions:
+        session=sessions[-1][1]
+        tables=[]
+        for df in (session.income_statement,session.balance_sheet,session.cash_flow):
+            copies=[df.assign(Company=f'C{i:05d}') for i in range(companies)]
+            tables.append(pd.concat(copies,ignore_index=True))
+        panel=stack_statements(*tables)
+        seconds, peak, metric=measure(lambda: compute_metrics(panel),repeat)
+        results.append(stage_result('compute_metrics',f'{companies} companies x{quarters}q',
+            len(metric),seconds,peak))
+    return pd.DataFrame(results)
+
+def versions():
+    '''Versions of Python and the libraries, saved with the report.
+
+    Returns:
+        versions (dict): Version of python, pandas, and numpy.
+    '''
+    return {
+        'python':platform.python_version(),
+        'pandas':pd.__version__,
+        'numpy':np.__version__,
+    }
+
+def statement_of_file(path):
+    '''Find the statement of saved HTML from its file name.
+
+    Args:
+        path (str): Location of the HTML file.
+
+    Returns:
+        statement (str): The statement, None when it is unknown.
+    '''
+    name=os.path.basename(path)
+    for statement, file_name in STATEMENT_FILES.items():
+        if file_name in name:
+            return statement
+    return None
+
+def main(argv=None):
+    '''Run the benchmarks and print the result.
+
+    Args:
+        argv (:obj:`list`, optional): Command line arguments. Defaults to None.
+    '''
+    parser=argparse.ArgumentParser(description='Offline benchmarks of ScraFSY.')
+    parser.add_argument('html',nargs='*',help='saved HTML named like <code>_<income_statement|balance_sheet|cash_flow>.html')
+    parser.add_argument('--repeat',type=int,default=5)
+    parser.add_argument('--companies',type=int,default=100)
+    parser.add_argument('--quarters',type=int,default=40,help='quarters of the scaled-up tables')
+    parser.add_argument('--fixtures',default=FIXTURE_DIR,help='directory of HTML snapshots')
+    parser.add_argument('--json',help='save the stage report to this file')
+    args=parser.parse_args(argv)
+    cases=[]
+    for path in args.html:
+        with open(path) as file:
+            cases.append((path,statement_of_file(path),file.read()))
+    if not cases:
+        cases=load_fixtures(args.fixtures)
+    if not cases:
+        for statement in STATEMENT_ITEMS:
+            cases.append((f'synthetic {statement}',statement,make_statement_html(statement)))
+    print('parse_data')
+    for name, statement, html in cases:
+        result=bench_parse(html,statement,args.repeat)
+        print(f"  {name}: bs4 {result['bs4']*1000:.1f} ms, lxml {result['lxml']*1000:.1f} ms, "
+            f"speedup {result['speedup']:.1f}x, same output {result['same']}")
+    print('value conversion')
+    df=make_value_frame(companies=args.companies)
+    result=bench_convert(df,args.repeat)
+    print(f"  {df.shape[0]} rows x {df.shape[1]} columns: value_to_num {result['value_to_num']*1000:.1f} ms, "
+        f"frame_to_num {result['frame_to_num']*1000:.1f} ms, speedup {result['speedup']:.1f}x, "
+        f"{result['cells_per_sec']:,.0f} cells/sec, same output {result['same']}")
+    print('stages')
+    report=bench_stages(cases,args.quarters,args.companies,args.repeat)
+    for row in report.itertuples():
+        print(f'  {row.stage:<22} {row.case:<40} {row.rows:>7} rows  '
+            f'{row.seconds*1000:9.2f} ms  {row.rows_per_sec:>12,.0f} rows/sec  {row.peak_mb:8.2f} MB')
+    if args.json:
+        with open(args.json,'w') as file:
+            json.dump({'versions':versions(),'stages':report.to_dict(orient='records')},file,indent=2)
+
+if __name__ == '__main__':
+    main()
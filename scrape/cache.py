@@ -0,0 +1,226 @@
+''' This module providing on-disk cache of Yahoo Finance responses.
+
+Quarterly statements change only a few times a year, so the raw HTML of
+the Selenium path and the JSON of the http fetcher can be kept on disk and
+reused. ResponseCache store them in one SQLite file, compressed with zlib,
+and keyed by company code, statement, period type, and source. Entries
+older than ttl are stale, the least recently used entries are removed when
+there are more than max_entries, and in cache-only mode nothing is
+downloaded at all.
+
+'''
+
+#Import Necessary Library
+import sqlite3
+import threading
+import zlib
+import time as waktu
+from scrape.ScraFSY import CacheMissError
+
+#Cache object constructor
+class ResponseCache():
+    '''
+    A class that represent on-disk response cache
+
+    Examples:
+        >>> cache=ResponseCache('yahoo_cache.sqlite',ttl=7*24*3600)
+        >>> bca=YFinanceScrapper('BBCA.JK',cache=cache)
+        >>> bca.get_alldata()
+        >>> cache.stats()
+
+    Args:
+        path (:obj:`str`, optional): Location of the SQLite file.
+            Defaults to 'yahoo_cache.sqlite'.
+        ttl (:obj:`float`, optional): Seconds before an entry is stale.
+            Defaults to 7 days.
+        max_entries (:obj:`int`, optional): Maximum number of entries, the
+            least recently used are removed. Defaults to 10000.
+        cache_only (:obj:`bool`, optional): Never download, use stale entries
+            and raise CacheMissError when there is no entry. Defaults to False.
+
+    Attributes:
+        cache_only (bool): Never download, only use the cache.
+        hits (int): Number of lookups that are answered by the cache.
+        max_entries (int): Maximum number of entries.
+        misses (int): Number of lookups that are not in the cache or stale.
+        path (str): Location of the SQLite file.
+        revalidated (int): Number of stale entries that are confirmed
+            unchanged by the server.
+        ttl (float): Seconds before an entry is stale.
+    '''
+    #Function for initialization of object
+    def __init__(self,path='yahoo_cache.sqlite',ttl=7*24*3600,max_entries=10000,cache_only=False):
+        self.path=path
+        self.ttl=ttl
+        self.max_entries=max_entries
+        self.cache_only=cache_only
+        self.hits=0
+        self.misses=0
+        self.revalidated=0
+        self.lock=threading.Lock()
+        self.connection=sqlite3.connect(path,check_same_thread=False)
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS responses (
+            company_code TEXT, statement TEXT, period TEXT, source TEXT,
+            body BLOB, etag TEXT, last_modified TEXT,
+            stored_at REAL, accessed_at REAL,
+            PRIMARY KEY (company_code, statement, period, source))''')
+        self.connection.commit()
+
+    def get_entry(self,company_code,statement,period='quarterly',source='html'):
+        '''Retrieve one entry without counting hit or miss.
+
+        Args:
+            company_code (str): The company code of the response.
+            statement (str): The statement of the response.
+            period (:obj:`str`, optional): Period type. Defaults to 'quarterly'.
+            source (:obj:`str`, optional): 'html' or 'json'. Defaults to 'html'.
+
+        Returns:
+            entry (dict): Dictionary with body, etag, last_modified, and fresh,
+                None if there is no entry.
+        '''
+        with self.lock:
+            row=self.connection.execute('''SELECT body, etag, last_modified, stored_at
+                FROM responses WHERE company_code=? AND statement=? AND period=? AND source=?''',
+                (company_code,statement,period,source)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute('''UPDATE responses SET accessed_at=?
+                WHERE company_code=? AND statement=? AND period=? AND source=?''',
+                (waktu.time(),company_code,statement,period,source))
+            self.connection.commit()
+        body, etag, last_modified, stored_at=row
+        return {
+            'body':zlib.decompress(body).decode('utf-8'),
+            'etag':etag,
+            'last_modified':last_modified,
+            'fresh':waktu.time()-stored_at < self.ttl,
+        }
+
+    def lookup(self,company_code,statement,period='quarterly',source='html'):
+        '''Retrieve one entry and count the hit or miss.
+
+        Args:
+            company_code (str): The company code of the response.
+            statement (str): The statement of the response.
+            period (:obj:`str`, optional): Period type. Defaults to 'quarterly'.
+            source (:obj:`str`, optional): 'html' or 'json'. Defaults to 'html'.
+
+        Returns:
+            entry (dict): Entry like get_entry, None if there is no entry.
+            usable (bool): True when the entry is used without download (it is
+                fresh, or the cache is in cache-only mode).
+
+        Raises:
+            CacheMissError: In cache-only mode when there is no entry.
+        '''
+        entry=self.get_entry(company_code,statement,period,source)
+        usable=entry is not None and (entry['fresh'] or self.cache_only)
+        with self.lock:
+            if usable:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not usable and self.cache_only:
+            raise CacheMissError(f'{statement} of {company_code} is not in the cache',
+                company_code,statement)
+        return entry, usable
+
+    def get(self,company_code,statement,period='quarterly',source='html'):
+        '''Retrieve cached body when it is fresh (or any body in cache-only mode).
+
+        Examples:
+            >>> cache=ResponseCache()
+            >>> html=cache.get('BBCA.JK','Income Statement')
+
+        Args:
+            company_code (str): The company code of the response.
+            statement (str): The statement of the response.
+            period (:obj:`str`, optional): Period type. Defaults to 'quarterly'.
+            source (:obj:`str`, optional): 'html' or 'json'. Defaults to 'html'.
+
+        Returns:
+            body (str): Cached body, None when it must be downloaded.
+        '''
+        entry, usable=self.lookup(company_code,statement,period,source)
+        return entry['body'] if usable else None
+
+    def put(self,company_code,statement,body,period='quarterly',source='html',
+            etag=None,last_modified=None):
+        '''Store one response body.
+
+        Args:
+            company_code (str): The company code of the response.
+            statement (str): The statement of the response.
+            body (str): The response body.
+            period (:obj:`str`, optional): Period type. Defaults to 'quarterly'.
+            source (:obj:`str`, optional): 'html' or 'json'. Defaults to 'html'.
+            etag (:obj:`str`, optional): ETag header of the response.
+                Defaults to None.
+            last_modified (:obj:`str`, optional): Last-Modified header of the
+                response. Defaults to None.
+        '''
+        now=waktu.time()
+        with self.lock:
+            self.connection.execute('''INSERT OR REPLACE INTO responses
+                VALUES (?,?,?,?,?,?,?,?,?)''',
+                (company_code,statement,period,source,
+                zlib.compress(body.encode('utf-8')),etag,last_modified,now,now))
+            #Remove the least recently used entries
+            self.connection.execute('''DELETE FROM responses WHERE rowid IN (
+                SELECT rowid FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)''',
+                (self.max_entries,))
+            self.connection.commit()
+
+    def touch(self,company_code,statement,period='quarterly',source='html'):
+        '''Mark a stale entry as fresh after the server confirm it is unchanged.
+
+        Args:
+            company_code (str): The company code of the response.
+            statement (str): The statement of the response.
+            period (:obj:`str`, optional): Period type. Defaults to 'quarterly'.
+            source (:obj:`str`, optional): 'html' or 'json'. Defaults to 'html'.
+        '''
+        now=waktu.time()
+        with self.lock:
+            self.connection.execute('''UPDATE responses SET stored_at=?, accessed_at=?
+                WHERE company_code=? AND statement=? AND period=? AND source=?''',
+                (now,now,company_code,statement,period,source))
+            self.connection.commit()
+            self.revalidated += 1
+
+    def evict_expired(self):
+        '''Remove all stale entries.
+
+        Returns:
+            removed (int): Number of removed entries.
+        '''
+        with self.lock:
+            cursor=self.connection.execute('DELETE FROM responses WHERE stored_at < ?',
+                (waktu.time()-self.ttl,))
+            self.connection.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        '''Remove all entries and reset the counters.'''
+        with self.lock:
+            self.connection.execute('DELETE FROM responses')
+            self.connection.commit()
+            self.hits=0
+            self.misses=0
+            self.revalidated=0
+
+    def stats(self):
+        '''Report the counters of the cache.
+
+        Returns:
+            stats (dict): Dictionary with hits, misses, revalidated, and entries.
+        '''
+        with self.lock:
+            entries=self.connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            return {'hits':self.hits,'misses':self.misses,
+                'revalidated':self.revalidated,'entries':entries}
+
+    def close(self):
+        '''Close the SQLite file.'''
+        self.connection.close()
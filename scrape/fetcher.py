@@ -0,0 +1,564 @@
+''' This module providing fetcher that collect statement data without browser.
+
+The financial statement tables in Yahoo Finance are filled from the
+fundamentals timeseries endpoint. HttpFetcher request that endpoint with
+pooled keep-alive session, and convert the JSON into the same features,
+collect, headers, and time lists that YFinanceScrapper.parse_data produce,
+so the result go to the same create_dataframe schema. Give a fetcher to
+YFinanceScrapper and the Selenium path is only used when the fetcher fail.
+
+The endpoint only return the line items that are requested. The request
+ask for the items in STATEMENT_ITEMS and EXTRA_ITEMS, and every quarterly
+item in the answer become a row. Items in STATEMENT_ITEMS get the row name
+of Yahoo table. Other items get a row name that is made from the key (Ex:
+'NetIncomeFromContinuingOperations' become 'Net Income From Continuing
+Operations'), which can differ in capital letters from the browser table,
+and line items that Yahoo show only in the browser are not in the result.
+So a statement from the fetcher and the same statement from the browser
+can have different columns.
+
+FixtureServer serve recorded JSON payloads from a local directory, so the
+fetcher can be used without internet. It answer conditional requests with
+304 like the real server.
+
+This module require requests for http session.
+
+'''
+
+#Import Necessary Library
+import re
+from abc import ABC, abstractmethod
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime
+import threading
+import json
+import zlib
+import os
+import time as waktu
+import requests
+from requests.adapters import HTTPAdapter
+
+#Line items of each statement as (timeseries key, row name in Yahoo table),
+#in the same order as the table in Yahoo Finance
+STATEMENT_ITEMS={
+    'Income Statement':[
+        ('TotalRevenue','Total Revenue'),
+        ('CostOfRevenue','Cost of Revenue'),
+        ('GrossProfit','Gross Profit'),
+        ('OperatingExpense','Operating Expense'),
+        ('OperatingIncome','Operating Income'),
+        ('InterestExpense','Interest Expense'),
+        ('PretaxIncome','Pretax Income'),
+        ('TaxProvision','Tax Provision'),
+        ('NetIncomeCommonStockholders','Net Income Common Stockholders'),
+        ('NetIncome','Net Income'),
+        ('BasicEPS','Basic EPS'),
+        ('DilutedEPS','Diluted EPS'),
+        ('BasicAverageShares','Basic Average Shares'),
+        ('DilutedAverageShares','Diluted Average Shares'),
+        ('EBIT','EBIT'),
+        ('EBITDA','EBITDA'),
+        ('NormalizedEBITDA','Normalized EBITDA'),
+    ],
+    'Balance Sheet':[
+        ('TotalAssets','Total Assets'),
+        ('CurrentAssets','Current Assets'),
+        ('CashAndCashEquivalents','Cash And Cash Equivalents'),
+        ('Inventory','Inventory'),
+        ('TotalLiabilitiesNetMinorityInterest','Total Liabilities Net Minority Interest'),
+        ('CurrentLiabilities','Current Liabilities'),
+        ('TotalEquityGrossMinorityInterest','Total Equity Gross Minority Interest'),
+        ('StockholdersEquity',"Stockholders' Equity"),
+        ('TotalCapitalization','Total Capitalization'),
+        ('CommonStockEquity','Common Stock Equity'),
+        ('NetTangibleAssets','Net Tangible Assets'),
+        ('WorkingCapital','Working Capital'),
+        ('InvestedCapital','Invested Capital'),
+        ('TangibleBookValue','Tangible Book Value'),
+        ('TotalDebt','Total Debt'),
+        ('NetDebt','Net Debt'),
+        ('ShareIssued','Share Issued'),
+        ('OrdinarySharesNumber','Ordinary Shares Number'),
+    ],
+    'Cash Flow':[
+        ('OperatingCashFlow','Operating Cash Flow'),
+        ('InvestingCashFlow','Investing Cash Flow'),
+        ('FinancingCashFlow','Financing Cash Flow'),
+        ('EndCashPosition','End Cash Position'),
+        ('CapitalExpenditure','Capital Expenditure'),
+        ('IssuanceOfDebt','Issuance of Debt'),
+        ('RepaymentOfDebt','Repayment of Debt'),
+        ('FreeCashFlow','Free Cash Flow'),
+    ],
+}
+
+#Other timeseries keys that are requested, their row names are made by key_label
+EXTRA_ITEMS={
+    'Income Statement':[
+        'OperatingRevenue','ExciseTaxes','SellingGeneralAndAdministration',
+        'GeneralAndAdministrativeExpense','SellingAndMarketingExpense','ResearchAndDevelopment',
+        'DepreciationAndAmortizationInIncomeStatement','OtherOperatingExpenses',
+        'NetNonOperatingInterestIncomeExpense','InterestIncomeNonOperating',
+        'InterestExpenseNonOperating','OtherIncomeExpense','SpecialIncomeCharges',
+        'OtherNonOperatingIncomeExpenses','EarningsFromEquityInterest',
+        'NetIncomeContinuousOperations','NetIncomeIncludingNoncontrollingInterests',
+        'MinorityInterests','PreferredStockDividends','DilutedNIAvailtoComStockholders',
+        'TotalExpenses','NetIncomeFromContinuingAndDiscontinuedOperation','NormalizedIncome',
+        'InterestIncome','NetInterestIncome','ReconciledCostOfRevenue','ReconciledDepreciation',
+        'NetIncomeFromContinuingOperationNetMinorityInterest','TotalUnusualItems',
+        'TotalUnusualItemsExcludingGoodwill','TaxRateForCalcs','TaxEffectOfUnusualItems',
+    ],
+    'Balance Sheet':[
+        'CashCashEquivalentsAndShortTermInvestments','OtherShortTermInvestments','Receivables',
+        'AccountsReceivable','OtherReceivables','PrepaidAssets','OtherCurrentAssets',
+        'TotalNonCurrentAssets','NetPPE','GrossPPE','AccumulatedDepreciation',
+        'GoodwillAndOtherIntangibleAssets','Goodwill','OtherIntangibleAssets',
+        'InvestmentsAndAdvances','LongTermEquityInvestment','NonCurrentDeferredTaxesAssets',
+        'OtherNonCurrentAssets','PayablesAndAccruedExpenses','Payables','AccountsPayable',
+        'TotalTaxPayable','CurrentAccruedExpenses','CurrentDebtAndCapitalLeaseObligation',
+        'CurrentDebt','OtherCurrentLiabilities','TotalNonCurrentLiabilitiesNetMinorityInterest',
+        'LongTermDebtAndCapitalLeaseObligation','LongTermDebt','NonCurrentDeferredTaxesLiabilities',
+        'OtherNonCurrentLiabilities','CapitalStock','CommonStock','AdditionalPaidInCapital',
+        'RetainedEarnings','TreasuryStock','GainsLossesNotAffectingRetainedEarnings',
+        'MinorityInterest','CapitalLeaseObligations','TreasurySharesNumber',
+    ],
+    'Cash Flow':[
+        'CashFlowFromContinuingOperatingActivities','NetIncomeFromContinuingOperations',
+        'DepreciationAndAmortization','DeferredTax','StockBasedCompensation','ChangeInWorkingCapital',
+        'ChangeInReceivables','ChangeInInventory','ChangeInPayablesAndAccruedExpense',
+        'OtherNonCashItems','TaxesRefundPaid','InterestPaidCFO','InterestReceivedCFO',
+        'DividendReceivedCFO','CashFlowFromContinuingInvestingActivities','NetPPEPurchaseAndSale',
+        'PurchaseOfPPE','SaleOfPPE','NetBusinessPurchaseAndSale','NetInvestmentPurchaseAndSale',
+        'PurchaseOfInvestment','SaleOfInvestment','NetOtherInvestingChanges',
+        'CashFlowFromContinuingFinancingActivities','NetIssuancePaymentsOfDebt',
+        'NetLongTermDebtIssuance','NetShortTermDebtIssuance','NetCommonStockIssuance',
+        'CommonStockIssuance','CommonStockPayments','CashDividendsPaid','CommonStockDividendPaid',
+        'NetOtherFinancingCharges','ChangesInCash','EffectOfExchangeRateChanges',
+        'BeginningCashPosition','IncomeTaxPaidSupplementalData','InterestPaidSupplementalData',
+    ],
+}
+
+#Name of fixture file and stored table of each statement
+STATEMENT_FILES={
+    'Income Statement':'income_statement',
+    'Balance Sheet':'balance_sheet',
+    'Cash Flow':'cash_flow',
+}
+
+TIMESERIES_PATH='/ws/fundamentals-timeseries/v1/finance/timeseries/'
+
+def key_label(key):
+    '''Make row name from timeseries key that is not in STATEMENT_ITEMS.
+
+    Examples:
+        >>> key_label('NetIncomeFromContinuingOperations')
+        'Net Income From Continuing Operations'
+
+    Args:
+        key (str): Timeseries key without 'quarterly' or 'trailing'.
+
+    Returns:
+        label (str): Key with a space before every word.
+    '''
+    return re.sub(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])',' ',key)
+
+def statement_keys(statement):
+    '''List timeseries keys of one statement with their row names.
+
+    Args:
+        statement (str): The selected statement.
+
+    Returns:
+        items (list): List of (timeseries key, row name), STATEMENT_ITEMS first.
+    '''
+    return STATEMENT_ITEMS[statement]+[(key,key_label(key)) for key in EXTRA_ITEMS[statement]]
+
+def currency_note(payload):
+    '''Create currency note like the one above Yahoo table.
+
+    Args:
+        payload (dict): JSON from fundamentals timeseries endpoint.
+
+    Returns:
+        note (list): List with the note text, empty when the currency is unknown.
+    '''
+    for result in payload['timeseries']['result']:
+        for name in result['meta']['type']:
+            for point in result.get(name) or []:
+                if point and point.get('currencyCode'):
+                    return [f"Currency in {point['currencyCode']}. All numbers in thousands"]
+    return []
+
+def format_value(key,raw):
+    '''Format raw timeseries value like the text in Yahoo table.
+
+    Values are shown in thousands with ',' separator, except per share
+    values that are shown with 2 decimals.
+
+    Args:
+        key (str): Timeseries key of the value.
+        raw (float): Raw value from the timeseries.
+
+    Returns:
+        text (str): Value in the format of Yahoo table.
+    '''
+    if raw is None:
+        return '-'
+    if key.endswith('EPS'):
+        return f'{raw:,.2f}'
+    return f'{round(raw/1000):,}'
+
+def timeseries_to_table(payload,statement):
+    '''Convert timeseries JSON of one statement to parsed table lists.
+
+    Every quarterly item in the payload become a row, the items of
+    STATEMENT_ITEMS first and the others in the order of the payload.
+
+    Examples:
+        >>> features, collect, headers, time = timeseries_to_table(payload,'Income Statement')
+
+    Args:
+        payload (dict): JSON from fundamentals timeseries endpoint.
+        statement (str): The selected statement that is gonna be converted.
+
+    Returns:
+        features (list): A list that contain name of features those are collected.
+        collect (list): A list that contain all name of features and their value.
+        headers (list): A list that contain name of headers in the table.
+        time (list): List of periodic of collected data.
+    '''
+    series={}
+    for result in payload['timeseries']['result']:
+        for name in result['meta']['type']:
+            series[name]=[point for point in result.get(name) or [] if point]
+    #Known items first, then every other quarterly item of the payload
+    items=list(STATEMENT_ITEMS[statement])
+    known={key for key, label in items}
+    for name in series:
+        key=name[len('quarterly'):]
+        if name.startswith('quarterly') and key not in known:
+            items.append((key,key_label(key)))
+            known.add(key)
+    #Collect all quarter, newest first
+    dates=set()
+    for key, label in items:
+        for point in series.get('quarterly'+key,[]):
+            dates.add(point['asOfDate'])
+    dates=sorted(dates,reverse=True)
+    time=[]
+    for date in dates:
+        day=datetime.strptime(date,'%Y-%m-%d')
+        time.append(f'{day.month}/{day.day}/{day.year}')
+    if statement != 'Balance Sheet':
+        headers=['Breakdown','ttm']+time
+    else:
+        headers=['Breakdown']+time
+    features=[]
+    collect=[]
+    for key, label in items:
+        quarterly={point['asOfDate']:point['reportedValue']['raw']
+            for point in series.get('quarterly'+key,[])}
+        if not quarterly:
+            continue
+        row=[label]
+        if statement != 'Balance Sheet':
+            trailing=series.get('trailing'+key,[])
+            row.append(format_value(key,trailing[-1]['reportedValue']['raw']) if trailing else '-')
+        for date in dates:
+            row.append(format_value(key,quarterly.get(date)))
+        features.append(label)
+        collect.append(row)
+    return features, collect, headers, time
+
+def request_params(base_url,company_code,statement,years=5):
+    '''Create url and query of timeseries request of one statement.
+
+    Args:
+        base_url (str): Address of the endpoint host.
+        company_code (str): The company code that you want to scrape.
+        statement (str): The selected statement that is gonna be scraped.
+        years (:obj:`int`, optional): Number of years of data that is
+            requested. Defaults to 5.
+
+    Returns:
+        url (str): Address of the request.
+        params (dict): Query of the request.
+    '''
+    types=[]
+    for key, label in statement_keys(statement):
+        types.append('quarterly'+key)
+        if statement != 'Balance Sheet':
+            types.append('trailing'+key)
+    now=int(waktu.time())
+    params={
+        'symbol':company_code,
+        'type':','.join(types),
+        'period1':now-years*366*24*3600,
+        'period2':now,
+    }
+    return base_url.rstrip('/')+TIMESERIES_PATH+company_code, params
+
+#Fetcher object constructor
+class BaseFetcher(ABC):
+    '''
+    A class that represent the interface of statement fetcher
+
+    A fetcher is given to YFinanceScrapper, and its fetch_table result is
+    used in place of get_html_data and parse_data. A subclass must
+    implement fetch_table before it can be created.
+    '''
+    @abstractmethod
+    def fetch_table(self,company_code,statement):
+        '''Retrieve parsed table lists of one statement.
+
+        Args:
+            company_code (str): The company code that you want to scrape.
+            statement (str): The selected statement that is gonna be scraped.
+
+        Returns:
+            features (list): A list that contain name of features those are collected.
+            collect (list): A list that contain all name of features and their value.
+            headers (list): A list that contain name of headers in the table.
+            time (list): List of periodic of collected data.
+            note (list): A list that contain note that explain value (Ex:Currency).
+        '''
+        raise NotImplementedError
+
+class HttpFetcher(BaseFetcher):
+    '''
+    A class that fetch statement data from Yahoo timeseries endpoint
+
+    Examples:
+        >>> fetcher=HttpFetcher()
+        >>> bca=YFinanceScrapper('BBCA.JK',fetcher=fetcher)
+        >>> bca.get_alldata()
+
+    Args:
+        base_url (:obj:`str`, optional): Address of the endpoint host.
+            Defaults to 'https://query1.finance.yahoo.com'.
+        pool_size (:obj:`int`, optional): Number of keep-alive connections
+            of the session. Defaults to 10.
+        timeout (:obj:`float`, optional): Seconds before a request is
+            cancelled. Defaults to 20.
+        years (:obj:`int`, optional): Number of years of data that is
+            requested. Defaults to 5.
+        cache (:obj:`cache.ResponseCache`, optional): On-disk cache of the
+            JSON, stale entries are revalidated with ETag and Last-Modified.
+            Defaults to None.
+
+    Attributes:
+        base_url (str): Address of the endpoint host.
+        cache (cache.ResponseCache): On-disk cache of the JSON.
+        session (requests.Session): Pooled keep-alive http session.
+        timeout (float): Seconds before a request is cancelled.
+        years (int): Number of years of data that is requested.
+    '''
+    #Function for initialization of object
+    def __init__(self,base_url='https://query1.finance.yahoo.com',pool_size=10,timeout=20,years=5,
+            cache=None):
+        self.base_url=base_url.rstrip('/')
+        self.cache=cache
+        self.timeout=timeout
+        self.years=years
+        self.session=requests.Session()
+        adapter=HTTPAdapter(pool_connections=pool_size,pool_maxsize=pool_size)
+        self.session.mount('http://',adapter)
+        self.session.mount('https://',adapter)
+        self.session.headers['User-Agent']='Mozilla/5.0'
+
+    def fetch_payload(self,company_code,statement):
+        '''Retrieve timeseries JSON of one statement.
+
+        A new response is not cached here, fetch_table cache it after the
+        table is found in it.
+
+        Args:
+            company_code (str): The company code that you want to scrape.
+            statement (str): The selected statement that is gonna be scraped.
+
+        Returns:
+            payload (dict): JSON from fundamentals timeseries endpoint.
+            response (requests.Response): The new response, None when the
+                payload come from the cache.
+        '''
+        entry=None
+        if self.cache is not None:
+            entry, usable=self.cache.lookup(company_code,statement,source='json')
+            if usable:
+                return json.loads(entry['body']), None
+        url, params=request_params(self.base_url,company_code,statement,self.years)
+        #Ask the server whether the stale entry is still valid
+        headers={}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match']=entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since']=entry['last_modified']
+        response=self.session.get(url,params=params,headers=headers,timeout=self.timeout)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(company_code,statement,source='json')
+            return json.loads(entry['body']), None
+        response.raise_for_status()
+        return response.json(), response
+
+    def fetch_table(self,company_code,statement):
+        '''Retrieve parsed table lists of one statement.
+
+        Examples:
+            >>> fetcher = HttpFetcher()
+            >>> features, collect, headers, time, note = fetcher.fetch_table('BBCA.JK','Income Statement')
+
+        Args:
+            company_code (str): The company code that you want to scrape.
+            statement (str): The selected statement that is gonna be scraped.
+
+        Returns:
+            features (list): A list that contain name of features those are collected.
+            collect (list): A list that contain all name of features and their value.
+            headers (list): A list that contain name of headers in the table.
+            time (list): List of periodic of collected data.
+            note (list): A list that contain note that explain value (Ex:Currency).
+
+        Raises:
+            ValueError: When the payload has no quarterly data.
+        '''
+        payload, response=self.fetch_payload(company_code,statement)
+        features, collect, headers, time=timeseries_to_table(payload,statement)
+        if not collect:
+            raise ValueError(f'There is no {statement} data of {company_code}')
+        #Cache the answer only after it is known to have data
+        if response is not None and self.cache is not None:
+            self.cache.put(company_code,statement,response.text,source='json',
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'))
+        return features, collect, headers, time, currency_note(payload)
+
+    def close(self):
+        '''Close the http session.'''
+        self.session.close()
+
+def record_fixture(fetcher,company_code,statement,directory):
+    '''Save timeseries JSON of one statement as fixture file.
+
+    Examples:
+        >>> record_fixture(HttpFetcher(),'BBCA.JK','Income Statement','fixtures')
+
+    Args:
+        fetcher (HttpFetcher): Fetcher that retrieve the JSON.
+        company_code (str): The company code that you want to scrape.
+        statement (str): The selected statement that is gonna be scraped.
+        directory (str): Directory of the fixture files.
+
+    Returns:
+        path (str): Location of the fixture file.
+    '''
+    payload, response=fetcher.fetch_payload(company_code,statement)
+    folder=os.path.join(directory,company_code)
+    os.makedirs(folder,exist_ok=True)
+    path=os.path.join(folder,STATEMENT_FILES[statement]+'.json')
+    with open(path,'w') as file:
+        json.dump(payload,file)
+    return path
+
+#Fixture server object constructor
+class FixtureServer():
+    '''
+    A class that serve recorded timeseries JSON from local directory
+
+    The fixture of one statement is found in
+    directory/<company_code>/<income_statement|balance_sheet|cash_flow>.json
+
+    Examples:
+        >>> with FixtureServer('fixtures') as server:
+        ...     bca=YFinanceScrapper('BBCA.JK',fetcher=HttpFetcher(server.url))
+        ...     bca.get_alldata()
+
+    Args:
+        directory (str): Directory of the fixture files.
+        port (:obj:`int`, optional): Port of the server, 0 choose a free
+            port. Defaults to 0.
+
+    Attributes:
+        directory (str): Directory of the fixture files.
+        server (http.server.ThreadingHTTPServer): The local http server.
+        url (str): Address of the server.
+    '''
+    #Function for initialization of object
+    def __init__(self,directory,port=0):
+        self.directory=directory
+        server=self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self,*args):
+                pass
+
+        self.server=ThreadingHTTPServer(('127.0.0.1',port),Handler)
+        self.url=f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread=None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self,*exc):
+        self.stop()
+
+    def fixture_path(self,path,query):
+        '''Find fixture file of a timeseries request.
+
+        Args:
+            path (str): Path of the request.
+            query (dict): Query of the request.
+
+        Returns:
+            location (str): Location of the fixture file, None if unknown.
+        '''
+        if not path.startswith(TIMESERIES_PATH):
+            return None
+        company_code=path[len(TIMESERIES_PATH):]
+        types=set(query.get('type',[''])[0].split(','))
+        for statement, items in STATEMENT_ITEMS.items():
+            if 'quarterly'+items[0][0] in types:
+                return os.path.join(self.directory,company_code,STATEMENT_FILES[statement]+'.json')
+        return None
+
+    def handle(self,request):
+        '''Answer one request with its fixture file.
+
+        Args:
+            request (http.server.BaseHTTPRequestHandler): The request.
+        '''
+        url=urlparse(request.path)
+        location=self.fixture_path(url.path,parse_qs(url.query))
+        if location is None or not os.path.exists(location):
+            request.send_response(404)
+            request.end_headers()
+            return
+        with open(location,'rb') as file:
+            body=file.read()
+        etag=f'"{zlib.crc32(body):08x}"'
+        if request.headers.get('If-None-Match') == etag:
+            request.send_response(304)
+            request.send_header('ETag',etag)
+            request.end_headers()
+            return
+        request.send_response(200)
+        request.send_header('ETag',etag)
+        request.send_header('Content-Type','application/json')
+        request.send_header('Content-Length',str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self):
+        '''Start serving in background thread.'''
+        self.thread=threading.Thread(target=self.server.serve_forever,daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        '''Stop the server.'''
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,165 @@
+''' This module providing incremental refresh of stored statements.
+
+A nightly refresh does not need to rebuild the full history of every
+company. The StatementStore already know which periods are stored for each
+company and statement, so a statement is only scraped again when its next
+quarter is due: the newest stored quarter end plus one quarter plus the
+reporting lag. After scraping, only the new periods and the restated
+periods (same time, different values) are merged into the store.
+
+'''
+
+#Import Necessary Library
+import pandas as pd
+from scrape.ScraFSY import YFinanceScrapper, DriverPool, error_text
+from scrape.fetcher import STATEMENT_FILES
+from scrape.storage import TIME_COLUMN, dedupe_columns
+
+def is_due(store,company_code,statement,today=None,period_days=91,lag_days=45):
+    '''Check whether a new quarter of one statement may be published.
+
+    Examples:
+        >>> is_due(StatementStore(),'BBCA.JK','Income Statement')
+
+    Args:
+        store (storage.StatementStore): Dataset that keep the statements.
+        company_code (str): The company code that is checked.
+        statement (str): The statement that is checked.
+        today (:obj:`pandas.Timestamp`, optional): Date of the refresh.
+            Defaults to None (today).
+        period_days (:obj:`int`, optional): Days of one fiscal period.
+            Defaults to 91.
+        lag_days (:obj:`int`, optional): Days between the period end and the
+            publication of the statement. Defaults to 45.
+
+    Returns:
+        due (bool): True when the statement is not stored or a new quarter
+            is expected.
+    '''
+    today=pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    periods=store.periods(STATEMENT_FILES[statement],company_code)
+    if periods.empty:
+        return True
+    return today >= periods.iloc[0]+pd.Timedelta(days=period_days+lag_days)
+
+def changed_rows(old,new,time_column='Time'):
+    '''Select rows of the new dataframe that are new or restated.
+
+    Examples:
+        >>> changed = changed_rows(store.read_partition('income_statement','BBCA.JK'),bca.income_statement)
+
+    Args:
+        old (pandas.Dataframe): Stored dataframe, None if nothing is stored.
+        new (pandas.Dataframe): Freshly scraped dataframe.
+        time_column (:obj:`str`, optional): Name of the time column.
+            Defaults to 'Time'.
+
+    Returns:
+        changed (pandas.Dataframe): Rows with new time, or with the same time
+            but different values or new columns.
+    '''
+    new=dedupe_columns(new)
+    if old is None or old.empty:
+        return new
+    old=old.drop_duplicates(subset=[time_column],keep='last').set_index(time_column)
+    current=new.set_index(time_column)
+    stored=old.reindex(index=current.index,columns=current.columns)
+    same=(current == stored) | (current.isna() & stored.isna())
+    changed=~same.all(axis=1).to_numpy()
+    return new[changed]
+
+def update_company(scraper,store,statements=None,today=None,period_days=91,lag_days=45,force=False):
+    '''Scrape due statements of one company and merge the changed periods.
+
+    Examples:
+        >>> bca = YFinanceScrapper('BBCA.JK')
+        >>> update_company(bca,StatementStore())
+
+    Args:
+        scraper (YFinanceScrapper): Scrape session of the company.
+        store (storage.StatementStore): Dataset that keep the statements.
+        statements (:obj:`list`, optional): List of statement that is refreshed.
+            Defaults to None (all statements).
+        today (:obj:`pandas.Timestamp`, optional): Date of the refresh.
+            Defaults to None (today).
+        period_days (:obj:`int`, optional): Days of one fiscal period.
+            Defaults to 91.
+        lag_days (:obj:`int`, optional): Days between the period end and the
+            publication of the statement. Defaults to 45.
+        force (:obj:`bool`, optional): Scrape even when no quarter is due.
+            Defaults to False.
+
+    Returns:
+        report (list): List of (company, statement, status, rows, error) where
+            status is 'skipped', 'unchanged', 'updated', or 'failed', and error
+            is the description of the failure or None.
+    '''
+    if statements is None:
+        statements=scraper.table_choice
+    report=[]
+    for statement in statements:
+        table=STATEMENT_FILES[statement]
+        if not force and not is_due(store,scraper.company_code,statement,today,period_days,lag_days):
+            report.append((scraper.company_code,statement,'skipped',0,None))
+            continue
+        try:
+            df=scraper.get_finance_data(statement=statement)
+            error='No data is returned'
+        except Exception as exc:
+            df=None
+            error=error_text(exc)
+        scraper.reset_data()
+        if df is None:
+            report.append((scraper.company_code,statement,'failed',0,error))
+            continue
+        old=store.read_partition(table,scraper.company_code)
+        changed=changed_rows(old,df,TIME_COLUMN[table])
+        if changed.empty:
+            report.append((scraper.company_code,statement,'unchanged',0,None))
+            continue
+        store.write(changed,table,mode='upsert')
+        report.append((scraper.company_code,statement,'updated',len(changed),None))
+    return report
+
+def refresh(codes,store,statements=None,today=None,period_days=91,lag_days=45,force=False,
+        pool=None,fetcher=None,cache=None):
+    '''Incrementally refresh the stored statements of many companies.
+
+    Examples:
+        >>> report = refresh(['AALI.JK','LSIP.JK'],StatementStore(),fetcher=HttpFetcher())
+
+    Args:
+        codes (list): List of company code that is refreshed.
+        store (storage.StatementStore): Dataset that keep the statements.
+        statements (:obj:`list`, optional): List of statement that is refreshed.
+            Defaults to None (all statements).
+        today (:obj:`pandas.Timestamp`, optional): Date of the refresh.
+            Defaults to None (today).
+        period_days (:obj:`int`, optional): Days of one fiscal period.
+            Defaults to 91.
+        lag_days (:obj:`int`, optional): Days between the period end and the
+            publication of the statement. Defaults to 45.
+        force (:obj:`bool`, optional): Scrape even when no quarter is due.
+            Defaults to False.
+        pool (:obj:`DriverPool`, optional): Pool of web drivers.
+            Defaults to None (one pool for the whole refresh).
+        fetcher (:obj:`fetcher.BaseFetcher`, optional): Fetcher without browser.
+            Defaults to None.
+        cache (:obj:`cache.ResponseCache`, optional): On-disk response cache.
+            Defaults to None.
+
+    Returns:
+        report (pandas.Dataframe): Dataframe with columns Company, Statement,
+            Status, Rows, and Error.
+    '''
+    #Share one browser for all companies when there is no pool
+    shared=pool if pool is not None else DriverPool()
+    report=[]
+    try:
+        for company_code in codes:
+            scraper=YFinanceScrapper(company_code,pool=shared,fetcher=fetcher,cache=cache)
+            report.extend(update_company(scraper,store,statements,today,period_days,lag_days,force))
+    finally:
+        if shared is not pool:
+            shared.close()
+    return pd.DataFrame(report,columns=['Company','Statement','Status','Rows','Error'])
@@ -0,0 +1,304 @@
+''' This module providing cross-sectional financial metrics of many companies.
+
+important_dataframe and metric_dataframe work on one company at a time.
+This module stack the statements of many companies into one panel that is
+aligned by (Company, Time), and compute every registered ratio on the whole
+panel in vectorized NumPy passes. Division by zero and missing values give
+nan instead of inf or an error.
+
+Ratios are declared in a registry. A ratio is a sum of features divided by
+a sum of features, a feature with '-' in front is subtracted, and a feature
+with 'ttm_' in front is the sum of the last four quarters. Growth metrics
+compare a feature with the previous quarter of the same company. When a
+quarter is missing (the time gap is not about 92 days), ttm and growth
+across the gap are nan.
+
+    >>> register_ratio('ttm_return_on_asset_ratio','ttm_net_income','total_assets')
+    >>> register_growth('total_assets_qoq_growth','total_assets')
+
+'''
+
+#Import Necessary Library
+import numpy as np
+import pandas as pd
+
+#Features of the panel as (statement, row name in Yahoo table),
+#the same features as YFinanceScrapper.important_dataframe
+FEATURES={
+    'current_assets':('Balance Sheet','Current Assets'),
+    'current_liabilities':('Balance Sheet','Current Liabilities'),
+    'inventories':('Balance Sheet','Inventory'),
+    'cash&cashequiv':('Balance Sheet','Cash And Cash Equivalents'),
+    'total_assets':('Balance Sheet','Total Assets'),
+    'total_liabilities':('Balance Sheet','Total Liabilities Net Minority Interest'),
+    'shareholder_equity':('Balance Sheet',"Stockholders' Equity"),
+    'operating_cashflow':('Cash Flow','Operating Cash Flow'),
+    'investing_cashflow':('Cash Flow','Investing Cash Flow'),
+    'financing_cashflow':('Cash Flow','Financing Cash Flow'),
+    'end_cash':('Cash Flow','End Cash Position'),
+    'gross_profit':('Income Statement','Gross Profit'),
+    'operating_income':('Income Statement','Operating Income'),
+    'total_revenue':('Income Statement','Total Revenue'),
+    'interest_expense':('Income Statement','Interest Expense'),
+    'net_income':('Income Statement','Net Income'),
+    'cost_of_good_sold':('Income Statement','Cost of Revenue'),
+    'EBIT':('Income Statement','EBIT'),
+    'EPS':('Income Statement','Basic EPS'),
+    'EBITDA':('Income Statement','Normalized EBITDA'),
+}
+
+#Registry of ratios, name as key and (numerator terms, denominator terms) as value
+RATIOS={}
+
+#Registry of quarter on quarter growth, name as key and feature as value
+GROWTHS={}
+
+def register_ratio(name,numerator,denominator):
+    '''Add a ratio to the registry.
+
+    Examples:
+        >>> register_ratio('acidtest_ratio',['current_assets','-inventories'],'current_liabilities')
+
+    Args:
+        name (str): Name of the ratio column.
+        numerator (str or list): Feature or list of features that are summed,
+            '-' in front subtract the feature and 'ttm_' in front use the sum
+            of the last four quarters.
+        denominator (str or list): Feature or list of features like numerator.
+    '''
+    if isinstance(numerator,str):
+        numerator=[numerator]
+    if isinstance(denominator,str):
+        denominator=[denominator]
+    RATIOS[name]=(list(numerator),list(denominator))
+
+def register_growth(name,feature):
+    '''Add a quarter on quarter growth metric to the registry.
+
+    Examples:
+        >>> register_growth('total_revenue_qoq_growth','total_revenue')
+
+    Args:
+        name (str): Name of the growth column.
+        feature (str): Feature that is compared with its previous quarter.
+    '''
+    GROWTHS[name]=feature
+
+#Ratios of YFinanceScrapper.metric_dataframe
+register_ratio('net_profit_margin','net_income','total_revenue')
+register_ratio('current_ratio','current_assets','current_liabilities')
+register_ratio('acidtest_ratio',['current_assets','-inventories'],'current_liabilities')
+register_ratio('cash_ratio','cash&cashequiv','current_liabilities')
+register_ratio('operating_cash_flow_ratio','operating_cashflow','current_liabilities')
+register_ratio('debt_ratio','total_liabilities','total_assets')
+register_ratio('return_on_asset_ratio','net_income','total_assets')
+register_ratio('debt_to_equity_ratio','total_liabilities','shareholder_equity')
+register_ratio('interest_coverage_ratio','EBIT','interest_expense')
+register_ratio('return_on_equity_ratio','net_income','shareholder_equity')
+register_ratio('gross_margin_ratio','gross_profit','total_revenue')
+register_ratio('operating_margin_ratio','operating_income','total_revenue')
+#Trailing twelve months and growth metrics
+register_ratio('ttm_net_profit_margin','ttm_net_income','ttm_total_revenue')
+register_ratio('ttm_return_on_equity_ratio','ttm_net_income','shareholder_equity')
+register_growth('total_revenue_qoq_growth','total_revenue')
+register_growth('net_income_qoq_growth','net_income')
+
+def stack_statements(income_statement,balance_sheet,cash_flow):
+    '''Align stacked statements of many companies into one feature panel.
+
+    Examples:
+        >>> panel = stack_statements(
+        ...     pd.concat([s.income_statement for s in sessions]),
+        ...     pd.concat([s.balance_sheet for s in sessions]),
+        ...     pd.concat([s.cash_flow for s in sessions]))
+
+    Args:
+        income_statement (pandas.Dataframe): Income statement of many companies.
+        balance_sheet (pandas.Dataframe): Balance sheet of many companies.
+        cash_flow (pandas.Dataframe): Cash flow of many companies.
+
+    Returns:
+        panel (pandas.Dataframe): Float64 features indexed by (Company, Time),
+            sorted by company and time.
+    '''
+    tables={
+        'Income Statement':income_statement,
+        'Balance Sheet':balance_sheet,
+        'Cash Flow':cash_flow,
+    }
+    parts=[]
+    for statement, df in tables.items():
+        columns={label:feature for feature, (source, label) in FEATURES.items()
+            if source == statement and label in df.columns}
+        part=df.loc[:,~df.columns.duplicated()].set_index(['Company','Time'])
+        part=part[list(columns)].rename(columns=columns)
+        parts.append(part[~part.index.duplicated(keep='last')])
+    panel=pd.concat(parts,axis=1,join='outer')
+    panel=panel.reindex(columns=list(FEATURES)).astype('float64')
+    return panel.sort_index()
+
+def panel_from_scrapers(scrapers):
+    '''Create feature panel from finished scrape sessions.
+
+    Examples:
+        >>> panel = panel_from_scrapers(collect.values())
+
+    Args:
+        scrapers (list): List of YFinanceScrapper after get_alldata.
+
+    Returns:
+        panel (pandas.Dataframe): Float64 features indexed by (Company, Time).
+    '''
+    scrapers=[scraper for scraper in scrapers if scraper.income_statement is not None]
+    return stack_statements(
+        pd.concat([scraper.income_statement for scraper in scrapers],ignore_index=True),
+        pd.concat([scraper.balance_sheet for scraper in scrapers],ignore_index=True),
+        pd.concat([scraper.cash_flow for scraper in scrapers],ignore_index=True))
+
+def safe_divide(numerator,denominator):
+    '''Divide arrays, division by zero or by nan give nan.
+
+    Args:
+        numerator (numpy.ndarray): Numerator values.
+        denominator (numpy.ndarray): Denominator values.
+
+    Returns:
+        result (numpy.ndarray): Float64 result.
+    '''
+    result=np.full(np.shape(numerator),np.nan)
+    valid=np.isfinite(numerator) & np.isfinite(denominator) & (denominator != 0)
+    np.divide(numerator,denominator,out=result,where=valid)
+    return result
+
+def company_codes(panel):
+    '''Integer code of the company of every row.
+
+    Args:
+        panel (pandas.Dataframe): Panel sorted by company and time.
+
+    Returns:
+        codes (numpy.ndarray): Integer code of the company of every row.
+    '''
+    return pd.factorize(panel.index.get_level_values('Company'))[0]
+
+def quarter_steps(panel,min_days=80,max_days=100):
+    '''Check which rows are the next quarter of the row before them.
+
+    A row follow its previous row when both are the same company and the
+    time gap is about one quarter (~92 days), so a missing quarter break
+    the chain.
+
+    Args:
+        panel (pandas.Dataframe): Panel sorted by company and time.
+        min_days (:obj:`int`, optional): Shortest gap of one quarter.
+            Defaults to 80.
+        max_days (:obj:`int`, optional): Longest gap of one quarter.
+            Defaults to 100.
+
+    Returns:
+        steps (numpy.ndarray): Boolean of every row, True when the row is
+            the next quarter of the previous row. The first row is False.
+    '''
+    codes=company_codes(panel)
+    times=panel.index.get_level_values('Time').to_numpy(dtype='datetime64[ns]')
+    days=(times[1:]-times[:-1])/np.timedelta64(1,'D')
+    steps=np.zeros(len(panel),dtype=bool)
+    steps[1:]=(codes[1:] == codes[:-1]) & (days >= min_days) & (days <= max_days)
+    return steps
+
+def ttm_values(values,steps,window=4):
+    '''Sum of the last consecutive quarters of the same company.
+
+    Args:
+        values (numpy.ndarray): Feature values sorted by company and time.
+        steps (numpy.ndarray): Result of quarter_steps.
+        window (:obj:`int`, optional): Number of quarters. Defaults to 4.
+
+    Returns:
+        ttm (numpy.ndarray): Rolling sum, nan when there are less than
+            window quarters, one of them is missing, or there is a gap.
+    '''
+    filled=np.where(np.isnan(values),0.0,values)
+    counts=np.cumsum(np.isnan(values))
+    breaks=np.cumsum(~steps)
+    sums=np.cumsum(filled)
+    ttm=np.full(values.shape,np.nan)
+    if len(values) < window:
+        return ttm
+    window_sum=sums[window-1:]-np.concatenate(([0.0],sums[:-window]))
+    window_nan=counts[window-1:]-np.concatenate(([0],counts[:-window]))
+    #Every row after the first row of the window must follow its previous row
+    window_break=breaks[window-1:]-breaks[:len(breaks)-window+1]
+    ttm[window-1:]=np.where((window_break == 0) & (window_nan == 0),window_sum,np.nan)
+    return ttm
+
+def term_values(panel,term,steps,cache):
+    '''Values of one registry term of the panel.
+
+    Args:
+        panel (pandas.Dataframe): Feature panel sorted by company and time.
+        term (str): Feature name, with optional 'ttm_' in front.
+        steps (numpy.ndarray): Result of quarter_steps.
+        cache (dict): Values that are already computed.
+
+    Returns:
+        values (numpy.ndarray): Float64 values of the term.
+    '''
+    if term not in cache:
+        if term.startswith('ttm_'):
+            cache[term]=ttm_values(term_values(panel,term[4:],steps,cache),steps)
+        else:
+            cache[term]=panel[term].to_numpy(dtype='float64')
+    return cache[term]
+
+def sum_terms(panel,terms,steps,cache):
+    '''Sum the signed terms of a ratio.
+
+    Args:
+        panel (pandas.Dataframe): Feature panel sorted by company and time.
+        terms (list): Features, '-' in front subtract the feature.
+        steps (numpy.ndarray): Result of quarter_steps.
+        cache (dict): Values that are already computed.
+
+    Returns:
+        total (numpy.ndarray): Float64 sum of the terms.
+    '''
+    total=np.zeros(len(panel))
+    for term in terms:
+        if term.startswith('-'):
+            total=total-term_values(panel,term[1:],steps,cache)
+        else:
+            total=total+term_values(panel,term,steps,cache)
+    return total
+
+def compute_metrics(panel,ratios=None,growths=None):
+    '''Compute registered metrics of all companies at once.
+
+    Examples:
+        >>> metric = compute_metrics(panel_from_scrapers(collect.values()))
+
+    Args:
+        panel (pandas.Dataframe): Feature panel from stack_statements.
+        ratios (:obj:`list`, optional): Names of ratios that are computed.
+            Defaults to None (all registered ratios).
+        growths (:obj:`list`, optional): Names of growth metrics that are
+            computed. Defaults to None (all registered growth metrics).
+
+    Returns:
+        metric (pandas.Dataframe): Metrics indexed by (Company, Time).
+    '''
+    panel=panel.sort_index()
+    steps=quarter_steps(panel)
+    cache={}
+    result={}
+    for name in (RATIOS if ratios is None else ratios):
+        numerator, denominator=RATIOS[name]
+        result[name]=safe_divide(sum_terms(panel,numerator,steps,cache),
+            sum_terms(panel,denominator,steps,cache))
+    for name in (GROWTHS if growths is None else growths):
+        values=term_values(panel,GROWTHS[name],steps,cache)
+        previous=np.concatenate(([np.nan],values[:-1]))
+        #Growth only against the previous quarter, not across a missing one
+        previous[~steps]=np.nan
+        result[name]=safe_divide(values-previous,np.abs(previous))
+    return pd.DataFrame(result,index=panel.index)
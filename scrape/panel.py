@@ -0,0 +1,204 @@
+''' This module providing memory-compact panel of one statement of many companies.
+
+A statement dataframe from create_dataframe repeat the company code as text
+in every row, and every company keep its own column names. CompactPanel keep
+the same data of many companies as:
+
+1. a categorical company column (one small integer per row),
+2. a datetime64 time column,
+3. one shared line-item dictionary (item name to column number), and
+4. one 2D float block with a row for each (company, time) and a column for
+   each line item. The block is float32 when every value fit float32
+   exactly, otherwise float64.
+
+memory_report measure the bytes per company before and after.
+
+'''
+
+#Import Necessary Library
+import numpy as np
+import pandas as pd
+
+def choose_dtype(values):
+    '''Choose float32 when it keep every value exactly, otherwise float64.
+
+    Args:
+        values (numpy.ndarray): Float64 values.
+
+    Returns:
+        dtype (numpy.dtype): float32 or float64.
+    '''
+    with np.errstate(over='ignore',invalid='ignore'):
+        narrow=values.astype('float32')
+    if np.array_equal(narrow.astype('float64'),values,equal_nan=True):
+        return np.dtype('float32')
+    return np.dtype('float64')
+
+#Compact panel object constructor
+class CompactPanel():
+    '''
+    A class that represent one statement of many companies in compact form
+
+    Examples:
+        >>> panel=CompactPanel.from_frames([s.income_statement for s in sessions])
+        >>> panel.nbytes()
+        >>> panel.company_frame('BBCA.JK')
+
+    Args:
+        companies (pandas.Categorical): Company of every row.
+        times (numpy.ndarray): Datetime64 time of every row.
+        items (list): Name of line item of every column of values.
+        values (numpy.ndarray): 2D float block, rows by items.
+
+    Attributes:
+        companies (pandas.Categorical): Company of every row.
+        item_index (dict): Dictionary that contain line item as key and
+            column number as value.
+        items (list): Name of line item of every column of values.
+        times (numpy.ndarray): Datetime64 time of every row.
+        values (numpy.ndarray): 2D float block, rows by items.
+    '''
+    #Function for initialization of object
+    def __init__(self,companies,times,items,values):
+        self.companies=companies
+        self.times=times
+        self.items=list(items)
+        self.item_index={item:column for column, item in enumerate(self.items)}
+        self.values=values
+
+    @classmethod
+    def from_frames(cls,frames,dtype='auto'):
+        '''Create panel from statement dataframes of many companies.
+
+        Examples:
+            >>> panel = CompactPanel.from_frames([s.balance_sheet for s in sessions])
+
+        Args:
+            frames (list): List of dataframe from create_dataframe, all from
+                the same statement.
+            dtype (:obj:`str`, optional): 'auto', 'float32', or 'float64'.
+                Defaults to 'auto'.
+
+        Returns:
+            panel (CompactPanel): Compact panel of the frames.
+        '''
+        frames=[df for df in frames if df is not None and len(df)]
+        #Shared line-item dictionary in order of first appearance
+        item_index={}
+        for df in frames:
+            for column in df.columns:
+                if column not in ('Company','Time') and column not in item_index:
+                    item_index[column]=len(item_index)
+        rows=sum(len(df) for df in frames)
+        values=np.full((rows,len(item_index)),np.nan)
+        companies=[]
+        times=[]
+        start=0
+        for df in frames:
+            df=df.loc[:,~df.columns.duplicated()]
+            columns=[column for column in df.columns if column not in ('Company','Time')]
+            positions=[item_index[column] for column in columns]
+            values[start:start+len(df),positions]=df[columns].to_numpy(dtype='float64')
+            companies.append(df['Company'].to_numpy(dtype=object))
+            times.append(df['Time'].to_numpy(dtype='datetime64[ns]'))
+            start += len(df)
+        if dtype == 'auto':
+            dtype=choose_dtype(values)
+        companies=pd.Categorical(np.concatenate(companies) if companies else [])
+        times=np.concatenate(times) if times else np.array([],dtype='datetime64[ns]')
+        return cls(companies,times,list(item_index),values.astype(dtype))
+
+    def nbytes(self):
+        '''Report the bytes that the panel use.
+
+        Returns:
+            nbytes (int): Bytes of company codes, categories, times, values,
+                and line-item names.
+        '''
+        categories=sum(len(code) for code in self.companies.categories)
+        names=sum(len(item) for item in self.items)
+        return (self.companies.codes.nbytes+categories+self.times.nbytes
+            +self.values.nbytes+names)
+
+    def item(self,name):
+        '''Values of one line item for all rows.
+
+        Args:
+            name (str): Name of line item.
+
+        Returns:
+            values (numpy.ndarray): Values of the line item.
+        '''
+        return self.values[:,self.item_index[name]]
+
+    def company_frame(self,company_code):
+        '''Dataframe of one company like create_dataframe output.
+
+        Args:
+            company_code (str): The company code.
+
+        Returns:
+            df (pandas.Dataframe): Dataframe with Company, Time, and the line
+                items that the company has.
+        '''
+        rows=np.asarray(self.companies == company_code)
+        values=self.values[rows]
+        has=~np.isnan(values).all(axis=0)
+        df=pd.DataFrame(values[:,has].astype('float64'),
+            columns=[item for item, keep in zip(self.items,has) if keep])
+        df.insert(0,'Time',self.times[rows])
+        df.insert(0,'Company',company_code)
+        return df
+
+    def to_frame(self):
+        '''Convert the panel to one wide dataframe.
+
+        Returns:
+            df (pandas.Dataframe): Dataframe with categorical Company, Time, and
+                one float column for every line item.
+        '''
+        df=pd.DataFrame(self.values,columns=self.items)
+        df.insert(0,'Time',self.times)
+        df.insert(0,'Company',self.companies)
+        return df
+
+def frame_nbytes(df):
+    '''Bytes that a dataframe use, including the text of object columns.
+
+    Args:
+        df (pandas.Dataframe): Dataframe that is measured.
+
+    Returns:
+        nbytes (int): Bytes of the dataframe.
+    '''
+    return int(df.memory_usage(index=True,deep=True).sum())
+
+def memory_report(frames,dtype='auto'):
+    '''Measure bytes per company before and after compacting.
+
+    Examples:
+        >>> memory_report([s.income_statement for s in sessions])
+
+    Args:
+        frames (list): List of dataframe from create_dataframe, all from the
+            same statement.
+        dtype (:obj:`str`, optional): dtype of CompactPanel. Defaults to 'auto'.
+
+    Returns:
+        report (dict): Companies, bytes before and after, bytes per company
+            before and after, ratio, and the chosen dtype.
+    '''
+    frames=[df for df in frames if df is not None and len(df)]
+    panel=CompactPanel.from_frames(frames,dtype=dtype)
+    companies=max(len(panel.companies.categories),1)
+    before=sum(frame_nbytes(df) for df in frames)
+    after=panel.nbytes()
+    return {
+        'companies':len(panel.companies.categories),
+        'bytes_before':before,
+        'bytes_after':after,
+        'bytes_per_company_before':before/companies,
+        'bytes_per_company_after':after/companies,
+        'ratio':before/after if after else float('nan'),
+        'dtype':str(panel.values.dtype),
+    }
@@ -0,0 +1,489 @@
+''' This module providing resumable scheduler for long scrapes of many companies.
+
+A scrape of thousands of companies take hours, and one flaky page or a
+crash should not mean starting over. JobQueue keep one job for every
+(company, statement) in a SQLite file with its state (pending, running,
+done, or failed), number of attempts, and the earliest time of the next
+attempt. Scheduler take the jobs one by one, write every finished statement
+to a StatementStore before the job is marked done, and retry failed jobs
+with exponential backoff up to a cap. A CircuitBreaker pause the scrape
+when too many of the recent jobs fail (Ex: Yahoo block the requests).
+
+When the process stop, the jobs that were running are pending again on the
+next start, and the done jobs are not scraped again, so the scrape resume
+where it stopped:
+
+    >>> run_universe(codes,StatementStore(),path='scrape_jobs.sqlite')
+
+'''
+
+#Import Necessary Library
+from collections import deque
+import random
+import sqlite3
+import threading
+import time as waktu
+import pandas as pd
+from scrape.ScraFSY import YFinanceScrapper, DriverPool, error_text
+from scrape.fetcher import STATEMENT_FILES
+
+#Job queue object constructor
+class JobQueue():
+    '''
+    A class that represent persistent queue of (company, statement) jobs
+
+    Examples:
+        >>> jobs=JobQueue('scrape_jobs.sqlite')
+        >>> jobs.add(['BBCA.JK','BMRI.JK'])
+        >>> jobs.counts()
+
+    Args:
+        path (:obj:`str`, optional): Location of the SQLite file.
+            Defaults to 'scrape_jobs.sqlite'.
+
+    Attributes:
+        path (str): Location of the SQLite file.
+        recovered (int): Number of running jobs that are set back to pending
+            when the queue is opened.
+    '''
+    #Function for initialization of object
+    def __init__(self,path='scrape_jobs.sqlite'):
+        self.path=path
+        self.lock=threading.Lock()
+        self.connection=sqlite3.connect(path,check_same_thread=False)
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS jobs (
+            company_code TEXT, statement TEXT, state TEXT, attempts INTEGER,
+            next_time REAL, error TEXT, updated_at REAL,
+            PRIMARY KEY (company_code, statement))''')
+        self.connection.commit()
+        self.recovered=self.recover()
+
+    def recover(self):
+        '''Set the jobs that were running when the process stopped back to pending.
+
+        Returns:
+            recovered (int): Number of jobs that are pending again.
+        '''
+        with self.lock:
+            cursor=self.connection.execute('''UPDATE jobs SET state='pending', updated_at=?
+                WHERE state='running' ''',(waktu.time(),))
+            self.connection.commit()
+        return cursor.rowcount
+
+    def add(self,codes,statements=None):
+        '''Add a job for every company and statement that is not in the queue.
+
+        Jobs that are already in the queue keep their state, so adding the
+        same companies again after a restart does not scrape them again.
+
+        Args:
+            codes (list): List of company code.
+            statements (:obj:`list`, optional): List of statement.
+                Defaults to None (all statements).
+
+        Returns:
+            added (int): Number of new jobs.
+        '''
+        if statements is None:
+            statements=list(STATEMENT_FILES)
+        now=waktu.time()
+        rows=[(code,statement,'pending',0,0.0,None,now) for code in codes for statement in statements]
+        with self.lock:
+            before=self.connection.total_changes
+            self.connection.executemany('INSERT OR IGNORE INTO jobs VALUES (?,?,?,?,?,?,?)',rows)
+            self.connection.commit()
+            return self.connection.total_changes-before
+
+    def claim(self,now=None):
+        '''Take the pending job that is due first and mark it running.
+
+        Args:
+            now (:obj:`float`, optional): Current time. Defaults to None (time.time()).
+
+        Returns:
+            job (tuple): (company_code, statement, attempts), None when no
+                pending job is due.
+        '''
+        now=waktu.time() if now is None else now
+        with self.lock:
+            row=self.connection.execute('''SELECT company_code, statement, attempts FROM jobs
+                WHERE state='pending' AND next_time <= ? ORDER BY next_time, rowid LIMIT 1''',
+                (now,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute('''UPDATE jobs SET state='running', updated_at=?
+                WHERE company_code=? AND statement=?''',(now,row[0],row[1]))
+            self.connection.commit()
+        return row
+
+    def next_wait(self,now=None):
+        '''Seconds until the next pending job is due.
+
+        Args:
+            now (:obj:`float`, optional): Current time. Defaults to None (time.time()).
+
+        Returns:
+            seconds (float): Seconds to wait, None when there is no pending job.
+        '''
+        now=waktu.time() if now is None else now
+        with self.lock:
+            row=self.connection.execute(
+                "SELECT MIN(next_time) FROM jobs WHERE state='pending'").fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0]-now,0.0)
+
+    def finish(self,company_code,statement):
+        '''Mark a job done.
+
+        Args:
+            company_code (str): The company code of the job.
+            statement (str): The statement of the job.
+        '''
+        with self.lock:
+            self.connection.execute('''UPDATE jobs SET state='done', attempts=attempts+1,
+                error=NULL, updated_at=? WHERE company_code=? AND statement=?''',
+                (waktu.time(),company_code,statement))
+            self.connection.commit()
+
+    def fail(self,company_code,statement,error,retry_at=None):
+        '''Record a failed attempt of a job.
+
+        Args:
+            company_code (str): The company code of the job.
+            statement (str): The statement of the job.
+            error (str): Description of the error.
+            retry_at (:obj:`float`, optional): Time of the next attempt.
+                Defaults to None (the job failed for good).
+        '''
+        state='failed' if retry_at is None else 'pending'
+        with self.lock:
+            self.connection.execute('''UPDATE jobs SET state=?, attempts=attempts+1,
+                next_time=?, error=?, updated_at=? WHERE company_code=? AND statement=?''',
+                (state,retry_at or 0.0,error,waktu.time(),company_code,statement))
+            self.connection.commit()
+
+    def release(self,company_code,statement):
+        '''Put a running job back to pending without counting an attempt.
+
+        Args:
+            company_code (str): The company code of the job.
+            statement (str): The statement of the job.
+        '''
+        with self.lock:
+            self.connection.execute('''UPDATE jobs SET state='pending', updated_at=?
+                WHERE company_code=? AND statement=?''',(waktu.time(),company_code,statement))
+            self.connection.commit()
+
+    def retry_failed(self):
+        '''Set the failed jobs back to pending with zero attempts.
+
+        Returns:
+            reset (int): Number of jobs that are pending again.
+        '''
+        with self.lock:
+            cursor=self.connection.execute('''UPDATE jobs SET state='pending', attempts=0,
+                next_time=0, updated_at=? WHERE state='failed' ''',(waktu.time(),))
+            self.connection.commit()
+        return cursor.rowcount
+
+    def counts(self):
+        '''Count the jobs in each state.
+
+        Returns:
+            counts (dict): Dictionary that contain pending, running, done, and
+                failed as key and number of jobs as value.
+        '''
+        counts={'pending':0,'running':0,'done':0,'failed':0}
+        with self.lock:
+            for state, number in self.connection.execute(
+                    'SELECT state, COUNT(*) FROM jobs GROUP BY state'):
+                counts[state]=number
+        return counts
+
+    def report(self):
+        '''List all jobs with their state.
+
+        Returns:
+            report (pandas.Dataframe): Dataframe with columns Company, Statement,
+                State, Attempts, and Error.
+        '''
+        with self.lock:
+            rows=self.connection.execute('''SELECT company_code, statement, state, attempts, error
+                FROM jobs ORDER BY rowid''').fetchall()
+        return pd.DataFrame(rows,columns=['Company','Statement','State','Attempts','Error'])
+
+    def close(self):
+        '''Close the SQLite connection.'''
+        self.connection.close()
+
+#Circuit breaker object constructor
+class CircuitBreaker():
+    '''
+    A class that stop the scrape for a while when too many jobs fail
+
+    The breaker is 'closed' while the jobs work. When the share of failures
+    in the last window jobs reach threshold, it is 'open' and no job is
+    started for cooldown seconds. After that it is 'half-open': one job is
+    tried, success close the breaker and failure open it again.
+
+    Examples:
+        >>> breaker=CircuitBreaker(window=20,threshold=0.5,cooldown=300)
+
+    Args:
+        window (:obj:`int`, optional): Number of recent jobs that are counted.
+            Defaults to 20.
+        threshold (:obj:`float`, optional): Share of failed jobs that open the
+            breaker. Defaults to 0.5.
+        cooldown (:obj:`float`, optional): Seconds the breaker stay open.
+            Defaults to 300.
+        min_calls (:obj:`int`, optional): Minimum number of recent jobs before
+            the breaker can open. Defaults to 5.
+
+    Attributes:
+        cooldown (float): Seconds the breaker stay open.
+        min_calls (int): Minimum number of recent jobs before the breaker can open.
+        opened (int): Number of times the breaker opened.
+        outcomes (collections.deque): Success (True) or failure (False) of
+            the recent jobs.
+        reopen_time (float): Time when an open breaker become half-open.
+        state (str): 'closed', 'open', or 'half-open'.
+        threshold (float): Share of failed jobs that open the breaker.
+    '''
+    #Function for initialization of object
+    def __init__(self,window=20,threshold=0.5,cooldown=300,min_calls=5):
+        self.threshold=threshold
+        self.cooldown=cooldown
+        self.min_calls=min_calls
+        self.outcomes=deque(maxlen=window)
+        self.state='closed'
+        self.reopen_time=0.0
+        self.opened=0
+
+    def allow(self,now=None):
+        '''Check whether a job can be started.
+
+        Args:
+            now (:obj:`float`, optional): Current time. Defaults to None (time.time()).
+
+        Returns:
+            allowed (bool): True when the breaker is closed or half-open.
+        '''
+        now=waktu.time() if now is None else now
+        if self.state == 'open' and now >= self.reopen_time:
+            self.state='half-open'
+        return self.state != 'open'
+
+    def record(self,success,now=None):
+        '''Add the outcome of one job.
+
+        Args:
+            success (bool): True when the job is done.
+            now (:obj:`float`, optional): Current time. Defaults to None (time.time()).
+        '''
+        now=waktu.time() if now is None else now
+        self.outcomes.append(success)
+        if self.state == 'half-open':
+            if success:
+                self.state='closed'
+                self.outcomes.clear()
+            else:
+                self.trip(now)
+            return
+        failures=self.outcomes.count(False)
+        if len(self.outcomes) >= self.min_calls and failures/len(self.outcomes) >= self.threshold:
+            self.trip(now)
+
+    def trip(self,now):
+        '''Open the breaker for cooldown seconds.
+
+        Args:
+            now (float): Current time.
+        '''
+        self.state='open'
+        self.reopen_time=now+self.cooldown
+        self.opened += 1
+
+#Scheduler object constructor
+class Scheduler():
+    '''
+    A class that run the jobs of a JobQueue with retries and circuit breaker
+
+    Examples:
+        >>> jobs=JobQueue('scrape_jobs.sqlite')
+        >>> jobs.add(['BBCA.JK','BMRI.JK'])
+        >>> scheduler=Scheduler(jobs,StatementStore())
+        >>> scheduler.run()
+
+    Args:
+        jobs (JobQueue): Persistent queue of the jobs.
+        store (storage.StatementStore): Dataset that keep the finished statements.
+        retries (:obj:`int`, optional): Number of retries of a failed job.
+            Defaults to 5.
+        backoff (:obj:`float`, optional): Seconds before the first retry, it
+            is doubled for each retry. Defaults to 30.
+        max_backoff (:obj:`float`, optional): Maximum seconds between two
+            attempts. Defaults to 3600.
+        breaker (:obj:`CircuitBreaker`, optional): Circuit breaker of the jobs.
+            Defaults to None (CircuitBreaker with default settings).
+        pool (:obj:`DriverPool`, optional): Pool of web drivers.
+            Defaults to None (a pool for each run).
+        fetcher (:obj:`fetcher.BaseFetcher`, optional): Fetcher without browser.
+            Defaults to None.
+        cache (:obj:`cache.ResponseCache`, optional): On-disk response cache.
+            Defaults to None.
+        instrumentation (:obj:`ScrapeMetrics`, optional): Timers and counters of all
+            sessions. Defaults to None.
+
+    Attributes:
+        backoff (float): Seconds before the first retry.
+        breaker (CircuitBreaker): Circuit breaker of the jobs.
+        cache (cache.ResponseCache): On-disk response cache.
+        fetcher (fetcher.BaseFetcher): Fetcher without browser.
+        instrumentation (ScrapeMetrics): Timers and counters of all sessions.
+        jobs (JobQueue): Persistent queue of the jobs.
+        max_backoff (float): Maximum seconds between two attempts.
+        pool (DriverPool): Pool of web drivers.
+        retries (int): Number of retries of a failed job.
+        store (storage.StatementStore): Dataset that keep the finished statements.
+    '''
+    #Function for initialization of object
+    def __init__(self,jobs,store,retries=5,backoff=30,max_backoff=3600,breaker=None,
+            pool=None,fetcher=None,cache=None,instrumentation=None):
+        self.jobs=jobs
+        self.store=store
+        self.retries=retries
+        self.backoff=backoff
+        self.max_backoff=max_backoff
+        self.breaker=breaker if breaker is not None else CircuitBreaker()
+        self.pool=pool
+        self.fetcher=fetcher
+        self.cache=cache
+        self.instrumentation=instrumentation
+
+    def retry_delay(self,attempts):
+        '''Seconds before the next attempt of a job.
+
+        Args:
+            attempts (int): Number of failed attempts of the job, including
+                the last one.
+
+        Returns:
+            delay (float): backoff doubled for each attempt, with random
+                jitter, not more than max_backoff.
+        '''
+        delay=self.backoff*2**(attempts-1)*(1+random.random())
+        return min(delay,self.max_backoff)
+
+    def run_job(self,company_code,statement,attempts,pool):
+        '''Scrape one statement, store it, and record the result in the queue.
+
+        Args:
+            company_code (str): The company code of the job.
+            statement (str): The statement of the job.
+            attempts (int): Number of earlier attempts of the job.
+            pool (DriverPool): Pool of web drivers.
+
+        Returns:
+            success (bool): True when the statement is stored.
+        '''
+        scraper=YFinanceScrapper(company_code,pool=pool,fetcher=self.fetcher,
+            cache=self.cache,instrumentation=self.instrumentation)
+        try:
+            df=scraper.get_finance_data(statement=statement)
+            if df is None:
+                raise ValueError('No data is returned')
+            self.store.write(df,STATEMENT_FILES[statement],mode='upsert')
+        except Exception as exc:
+            error=error_text(exc)
+            if attempts+1 > self.retries:
+                self.jobs.fail(company_code,statement,error)
+            else:
+                self.jobs.fail(company_code,statement,error,
+                    waktu.time()+self.retry_delay(attempts+1))
+            return False
+        self.jobs.finish(company_code,statement)
+        return True
+
+    def run(self,max_jobs=None,max_seconds=None):
+        '''Run the jobs until all are done or failed.
+
+        Examples:
+            >>> Scheduler(JobQueue(),StatementStore()).run(max_seconds=3600)
+
+        Args:
+            max_jobs (:obj:`int`, optional): Stop after this number of
+                attempts. Defaults to None (no limit).
+            max_seconds (:obj:`float`, optional): Stop after this number of
+                seconds, the rest continue in the next run. Defaults to None.
+
+        Returns:
+            counts (dict): Number of jobs in each state after the run.
+        '''
+        pool=self.pool if self.pool is not None else DriverPool()
+        started=waktu.time()
+        attempted=0
+        try:
+            while max_jobs is None or attempted < max_jobs:
+                now=waktu.time()
+                if max_seconds is not None and now-started >= max_seconds:
+                    break
+                #Wait while the breaker is open, but not past max_seconds
+                if not self.breaker.allow(now):
+                    wait=max(self.breaker.reopen_time-now,0)
+                    if max_seconds is not None:
+                        wait=min(wait,max(started+max_seconds-now,0))
+                    waktu.sleep(wait)
+                    continue
+                job=self.jobs.claim(now)
+                if job is None:
+                    wait=self.jobs.next_wait(now)
+                    if wait is None:
+                        break
+                    if max_seconds is not None:
+                        wait=min(wait,max(started+max_seconds-now,0))
+                    waktu.sleep(wait)
+                    continue
+                company_code, statement, attempts=job
+                try:
+                    success=self.run_job(company_code,statement,attempts,pool)
+                except BaseException:
+                    #Keep the job for the next run when the run is interrupted
+                    self.jobs.release(company_code,statement)
+                    raise
+                self.breaker.record(success)
+                attempted += 1
+        finally:
+            if pool is not self.pool:
+                pool.close()
+        return self.jobs.counts()
+
+def run_universe(codes,store,path='scrape_jobs.sqlite',statements=None,**kwargs):
+    '''Scrape many companies with a resumable job queue.
+
+    Call it again with the same path after a crash and only the unfinished
+    jobs are scraped.
+
+    Examples:
+        >>> counts, report = run_universe(codes,StatementStore(),fetcher=HttpFetcher())
+
+    Args:
+        codes (list): List of company code that you want to scrape.
+        store (storage.StatementStore): Dataset that keep the finished statements.
+        path (:obj:`str`, optional): Location of the SQLite file of the jobs.
+            Defaults to 'scrape_jobs.sqlite'.
+        statements (:obj:`list`, optional): List of statement that is scraped.
+            Defaults to None (all statements).
+        **kwargs: Other arguments of Scheduler (Ex: retries, backoff, or fetcher).
+
+    Returns:
+        counts (dict): Number of jobs in each state.
+        report (pandas.Dataframe): State, attempts, and error of every job.
+    '''
+    jobs=JobQueue(path)
+    try:
+        jobs.add(codes,statements)
+        counts=Scheduler(jobs,store,**kwargs).run()
+        return counts, jobs.report()
+    finally:
+        jobs.close()
@@ -0,0 +1,253 @@
+''' This module providing columnar storage of the scraped dataframes.
+
+StatementStore keep income_statement, balance_sheet, cash_flow,
+imp_dataframe, and metric of many companies in Parquet or Feather files
+that are partitioned by table and company:
+
+    <root>/<table>/company=<company_code>/part.parquet
+
+Unlike csv, the files keep the dtype of every column (Ex: the Time
+datetime column), new quarters can be appended or upserted into the stored
+partition, and only the selected columns are read back. Reading many
+companies go through one pyarrow dataset over their files, so the column
+projection and the file reads are done by pyarrow in one call.
+
+This module require pyarrow for Parquet and Feather files.
+
+'''
+
+#Import Necessary Library
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
+
+#Name of the time column of each table
+TIME_COLUMN={
+    'income_statement':'Time',
+    'balance_sheet':'Time',
+    'cash_flow':'Time',
+    'imp_dataframe':'time',
+    'metric':'time',
+}
+
+#Name of the company column of each table
+COMPANY_COLUMN={
+    'income_statement':'Company',
+    'balance_sheet':'Company',
+    'cash_flow':'Company',
+    'imp_dataframe':'company',
+    'metric':'company',
+}
+
+def dedupe_columns(df):
+    '''Rename duplicated column names to name.1, name.2, and so on.
+
+    Columnar files can not keep two columns with the same name.
+
+    Args:
+        df (pandas.Dataframe): Dataframe that is checked.
+
+    Returns:
+        df (pandas.Dataframe): Dataframe with unique column names.
+    '''
+    if df.columns.is_unique:
+        return df
+    seen={}
+    columns=[]
+    for column in df.columns:
+        if column in seen:
+            seen[column] += 1
+            columns.append(f'{column}.{seen[column]}')
+        else:
+            seen[column]=0
+            columns.append(column)
+    df=df.copy()
+    df.columns=columns
+    return df
+
+#Store object constructor
+class StatementStore():
+    '''
+    A class that represent partitioned columnar storage of the dataframes
+
+    Examples:
+        >>> store=StatementStore('parquet_files')
+        >>> bca=YFinanceScrapper('BBCA.JK')
+        >>> bca.get_alldata()
+        >>> bca.convert_to_store('income_statement',store)
+        >>> store.read('income_statement',columns=['Time','Total Revenue'])
+
+    Args:
+        root (:obj:`str`, optional): Directory of the dataset.
+            Defaults to 'parquet_files'.
+        file_format (:obj:`str`, optional): 'parquet' or 'feather'.
+            Defaults to 'parquet'.
+
+    Attributes:
+        file_format (str): 'parquet' or 'feather'.
+        root (str): Directory of the dataset.
+    '''
+    #Function for initialization of object
+    def __init__(self,root='parquet_files',file_format='parquet'):
+        if file_format not in ('parquet','feather'):
+            raise ValueError("file_format must be 'parquet' or 'feather'")
+        self.root=root
+        self.file_format=file_format
+
+    def partition_path(self,table,company_code):
+        '''Location of the file of one table and company.
+
+        Args:
+            table (str): Name of table (Ex: 'income_statement').
+            company_code (str): The company code of the partition.
+
+        Returns:
+            path (str): Location of the partition file.
+        '''
+        return os.path.join(self.root,table,f'company={company_code}',f'part.{self.file_format}')
+
+    def companies(self,table):
+        '''List company codes that are stored in one table.
+
+        Args:
+            table (str): Name of table.
+
+        Returns:
+            codes (list): List of company code.
+        '''
+        folder=os.path.join(self.root,table)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name[len('company='):] for name in os.listdir(folder)
+            if name.startswith('company=') and os.path.exists(self.partition_path(table,name[len('company='):])))
+
+    def read_partition(self,table,company_code,columns=None):
+        '''Read one table of one company.
+
+        Args:
+            table (str): Name of table.
+            company_code (str): The company code of the partition.
+            columns (:obj:`list`, optional): Columns that are read, columns that
+                are not in the partition are skipped. Defaults to None (all).
+
+        Returns:
+            df (pandas.Dataframe): Stored dataframe, None if there is no partition.
+        '''
+        path=self.partition_path(table,company_code)
+        if not os.path.exists(path):
+            return None
+        if self.file_format == 'parquet':
+            names=pq.read_schema(path).names
+        else:
+            names=feather.read_table(path,memory_map=True).schema.names
+        if columns is not None:
+            columns=[column for column in columns if column in names]
+        if self.file_format == 'parquet':
+            return pd.read_parquet(path,columns=columns)
+        return pd.read_feather(path,columns=columns)
+
+    def write_partition(self,df,table,company_code):
+        '''Replace the file of one table and company.
+
+        The file is written beside and then renamed, so a failed write does not
+        break the stored partition.
+
+        Args:
+            df (pandas.Dataframe): Dataframe that is stored.
+            table (str): Name of table.
+            company_code (str): The company code of the partition.
+        '''
+        path=self.partition_path(table,company_code)
+        os.makedirs(os.path.dirname(path),exist_ok=True)
+        temporary=path+'.tmp'
+        df=dedupe_columns(df).reset_index(drop=True)
+        if self.file_format == 'parquet':
+            df.to_parquet(temporary,index=False)
+        else:
+            df.to_feather(temporary)
+        os.replace(temporary,path)
+
+    def write(self,df,table,mode='upsert'):
+        '''Store dataframe of one or many companies.
+
+        Examples:
+            >>> store = StatementStore()
+            >>> store.write(bca.income_statement,'income_statement',mode='upsert')
+
+        Args:
+            df (pandas.Dataframe): Dataframe that is stored.
+            table (str): Name of table (Ex: 'income_statement').
+            mode (:obj:`str`, optional): 'overwrite' replace the stored rows,
+                'append' add the rows, and 'upsert' add new periods and replace
+                the stored periods with the same time. Defaults to 'upsert'.
+
+        Returns:
+            rows (int): Number of stored rows after writing.
+        '''
+        if mode not in ('overwrite','append','upsert'):
+            raise ValueError("mode must be 'overwrite', 'append', or 'upsert'")
+        time_column=TIME_COLUMN[table]
+        company_column=COMPANY_COLUMN[table]
+        df=dedupe_columns(df)
+        rows=0
+        for company_code, new in df.groupby(company_column,sort=False):
+            old=None if mode == 'overwrite' else self.read_partition(table,company_code)
+            if old is not None:
+                new=pd.concat([old,new],ignore_index=True)
+                if mode == 'upsert':
+                    new=new.drop_duplicates(subset=[time_column],keep='last')
+                new=new.sort_values(time_column,ascending=False,kind='stable')
+            self.write_partition(new,table,company_code)
+            rows += len(new)
+        return rows
+
+    def read(self,table,companies=None,columns=None):
+        '''Read one table of many companies.
+
+        Examples:
+            >>> store = StatementStore()
+            >>> df = store.read('balance_sheet',companies=['BBCA.JK'],columns=['Time','Total Assets'])
+
+        Args:
+            table (str): Name of table.
+            companies (:obj:`list`, optional): List of company code.
+                Defaults to None (all stored companies).
+            columns (:obj:`list`, optional): Columns that are read.
+                Defaults to None (all).
+
+        Returns:
+            df (pandas.Dataframe): Stored rows of the companies.
+        '''
+        if companies is None:
+            companies=self.companies(table)
+        paths=[self.partition_path(table,company_code) for company_code in companies]
+        paths=[path for path in paths if os.path.exists(path)]
+        if not paths:
+            return pd.DataFrame(columns=columns)
+        file_format='parquet' if self.file_format == 'parquet' else 'ipc'
+        #Companies can have different columns, so the schema is the union of all files
+        dataset=ds.dataset(paths,format=file_format)
+        schema=pa.unify_schemas([fragment.physical_schema for fragment in dataset.get_fragments()],
+            promote_options='permissive')
+        dataset=ds.dataset(paths,schema=schema,format=file_format)
+        if columns is not None:
+            columns=[column for column in columns if column in schema.names]
+        return dataset.to_table(columns=columns).to_pandas()
+
+    def periods(self,table,company_code):
+        '''List the stored periods of one table and company.
+
+        Args:
+            table (str): Name of table.
+            company_code (str): The company code of the partition.
+
+        Returns:
+            periods (pandas.Series): Stored time values, newest first.
+        '''
+        df=self.read_partition(table,company_code,columns=[TIME_COLUMN[table]])
+        if df is None or TIME_COLUMN[table] not in df:
+            return pd.Series([],dtype='datetime64[ns]')
+        return df[TIME_COLUMN[table]].sort_values(ascending=False).reset_index(drop=True)
@@ -0,0 +1,58 @@
+''' Shared fixtures of the tests.
+
+The statement pages are synthetic pages with the markup of Yahoo Finance
+table that are made by scrape.benchmark.make_statement_html, and the
+timeseries payloads are made in a temporary directory and served by
+FixtureServer, so no browser or internet is needed.
+'''
+
+#Import Necessary Library
+import json
+import os
+import random
+import pytest
+from scrape.benchmark import make_statement_html
+from scrape.fetcher import FixtureServer, STATEMENT_ITEMS, STATEMENT_FILES
+
+#Quarter ends of the timeseries payloads, newest first
+DATES=['2022-12-31','2022-09-30','2022-06-30','2022-03-31','2021-12-31','2021-09-30']
+
+def timeseries_payload(statement,seed=0):
+    '''Create timeseries JSON of one statement like Yahoo endpoint.
+
+    Args:
+        statement (str): The statement of the payload.
+        seed (:obj:`int`, optional): Seed of the random values. Defaults to 0.
+
+    Returns:
+        payload (dict): Timeseries payload with every quarterly item.
+    '''
+    rng=random.Random(seed)
+    result=[]
+    for key, label in STATEMENT_ITEMS[statement]:
+        name='quarterly'+key
+        points=[{'asOfDate':date,'reportedValue':{'raw':rng.uniform(1e6,1e9)}} for date in DATES]
+        result.append({'meta':{'type':[name]},name:points})
+    return {'timeseries':{'result':result}}
+
+@pytest.fixture(scope='session')
+def pages():
+    '''Synthetic HTML of the three statements, statement as key.'''
+    return {statement:make_statement_html(statement,quarters=8,page_noise=50,seed=seed)
+        for seed, statement in enumerate(STATEMENT_ITEMS)}
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    '''Directory with timeseries payloads of five companies.'''
+    for seed, company_code in enumerate(['AAA','BBB','CCC','DDD','EEE']):
+        os.makedirs(tmp_path/company_code)
+        for statement, name in STATEMENT_FILES.items():
+            with open(tmp_path/company_code/f'{name}.json','w') as file:
+                json.dump(timeseries_payload(statement,seed),file)
+    return tmp_path
+
+@pytest.fixture
+def server(fixture_dir):
+    '''FixtureServer of fixture_dir.'''
+    with FixtureServer(str(fixture_dir)) as server:
+        yield server
@@ -0,0 +1,43 @@
+''' Tests of the asynchronous scraper. '''
+
+#Import Necessary Library
+import asyncio
+import pytest
+
+httpx=pytest.importorskip('httpx')
+from scrape.asyncscrape import AsyncYFinanceScrapper, scrape_all
+
+def test_scrape_all_scrape_repeated_code_once(server):
+    sessions, failures=asyncio.run(scrape_all(['AAA','BBB','AAA'],base_url=server.url,retries=0))
+    assert list(sessions) == ['AAA','BBB']
+    assert failures == {}
+    assert len(sessions['AAA'].income_statement) == 6
+
+def test_scrape_all_report_unknown_company(server):
+    sessions, failures=asyncio.run(scrape_all(['AAA','ZZZ'],base_url=server.url,retries=0))
+    assert list(sessions) == ['AAA']
+    assert list(failures) == ['ZZZ']
+
+def test_failed_statement_cancel_the_other_requests():
+    requests=[]
+
+    async def handler(request):
+        requests.append(request.url.params['type'])
+        if 'quarterlyTotalRevenue' in request.url.params['type']:
+            return httpx.Response(404)
+        await asyncio.sleep(0.05)
+        return httpx.Response(503)
+
+    async def run():
+        transport=httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            scraper=AsyncYFinanceScrapper('AAA',client=client,base_url='http://test',
+                retries=5,backoff=0.05)
+            with pytest.raises(httpx.HTTPStatusError) as error:
+                await scraper.get_alldata()
+            assert error.value.response.status_code == 404
+            sent=len(requests)
+            await asyncio.sleep(0.5)
+            return sent
+    sent=asyncio.run(run())
+    assert len(requests) == sent <= 3
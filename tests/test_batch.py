@@ -0,0 +1,69 @@
+''' Tests of the streaming batch scraper. '''
+
+#Import Necessary Library
+import threading
+import time as waktu
+import pytest
+from scrape.ScraFSY import ScrapeMetrics, error_text
+from scrape.batch import iter_statements
+from scrape.cache import ResponseCache, CacheMissError
+from scrape.fetcher import HttpFetcher
+
+class CountingFetcher(HttpFetcher):
+    '''HttpFetcher that count the fetched tables.'''
+    def __init__(self,base_url):
+        super().__init__(base_url)
+        self.fetched=0
+        self.lock=threading.Lock()
+
+    def fetch_table(self,company_code,statement):
+        with self.lock:
+            self.fetched += 1
+        return super().fetch_table(company_code,statement)
+
+CODES=['AAA','BBB','CCC','DDD','EEE']
+
+def test_iter_statements_yield_all_statements(server):
+    records=list(iter_statements(CODES,workers=2,rate=0,fetcher=HttpFetcher(server.url)))
+    assert len(records) == 15
+    assert {(company,statement) for company, statement, df in records} == {
+        (company,statement) for company in CODES
+        for statement in ('Income Statement','Balance Sheet','Cash Flow')}
+    assert all(len(df) == 6 for company, statement, df in records)
+
+def test_workers_wait_for_slow_consumer(server):
+    fetcher=CountingFetcher(server.url)
+    records=iter_statements(CODES,workers=1,rate=0,buffer=2,fetcher=fetcher)
+    next(records)
+    waktu.sleep(0.5)
+    #One record is taken, two wait in the queue, and one wait to be put
+    assert fetcher.fetched <= 4
+    records.close()
+
+def test_early_close_stop_workers(server):
+    fetcher=CountingFetcher(server.url)
+    before=threading.active_count()
+    records=iter_statements(CODES,workers=2,rate=0,buffer=1,fetcher=fetcher)
+    next(records)
+    records.close()
+    fetched=fetcher.fetched
+    waktu.sleep(0.3)
+    assert fetcher.fetched == fetched < 15
+    assert threading.active_count() <= before
+
+def test_on_error_modes(server,tmp_path):
+    cache=ResponseCache(str(tmp_path/'cache.sqlite'),cache_only=True)
+    fetcher=HttpFetcher(server.url,cache=cache)
+    metrics=ScrapeMetrics()
+    assert list(iter_statements(['AAA'],rate=0,fetcher=fetcher)) == []
+    records=list(iter_statements(['AAA'],rate=0,on_error='yield',fetcher=fetcher,
+        instrumentation=metrics))
+    assert len(records) == 3
+    assert all(isinstance(error,CacheMissError) for company, statement, error in records)
+    assert error_text(records[0][2]).startswith('CacheMissError: ')
+    assert metrics.snapshot()['counters']['fetch_errors'] == 3
+    with pytest.raises(CacheMissError):
+        list(iter_statements(['AAA'],rate=0,on_error='raise',fetcher=fetcher))
+    with pytest.raises(ValueError):
+        next(iter_statements(['AAA'],on_error='ignore'))
+    cache.close()
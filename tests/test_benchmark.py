@@ -0,0 +1,75 @@
+''' Benchmarks of every stage of scrape.benchmark.
+
+They are deselected by default, run them with
+
+    python -m pytest -m bench
+
+The stages run on the pages that record_html saved in scrape/fixtures.
+There are no recorded pages in the repository yet, so those cases are
+skipped and the stages run on synthetic pages of make_statement_html.
+'''
+
+#Import Necessary Library
+import json
+import math
+import pytest
+from scrape.benchmark import (bench_convert, bench_parse, bench_stages, load_fixtures,
+    make_statement_html, make_value_frame, main)
+from scrape.fetcher import STATEMENT_ITEMS
+
+pytestmark=pytest.mark.bench
+
+#Stages that bench_stages must report
+STAGES=['parse_data (bs4)','parse_data (lxml)','create_dataframe','value_to_num','frame_to_num',
+    'important_dataframe','metric_dataframe','compute_metrics']
+
+@pytest.fixture(scope='module')
+def synthetic_cases():
+    return [(f'synthetic {statement}',statement,make_statement_html(statement,quarters=8,seed=seed))
+        for seed, statement in enumerate(STATEMENT_ITEMS)]
+
+@pytest.fixture(scope='module')
+def report(synthetic_cases):
+    return bench_stages(synthetic_cases,quarters=12,companies=10,repeat=2)
+
+def test_report_has_every_stage(report):
+    assert list(report.columns) == ['stage','case','rows','seconds','rows_per_sec','peak_mb']
+    assert set(report['stage']) == set(STAGES)
+
+@pytest.mark.parametrize('stage',STAGES)
+def test_stage_report_fields(report,stage):
+    rows=report[report['stage'] == stage]
+    assert len(rows) > 0
+    for row in rows.itertuples():
+        assert row.rows > 0
+        assert row.seconds > 0
+        assert math.isfinite(row.rows_per_sec) and row.rows_per_sec > 0
+        assert row.peak_mb >= 0
+
+@pytest.mark.parametrize('statement',list(STATEMENT_ITEMS))
+def test_lxml_parser_is_faster(synthetic_cases,statement):
+    html={case_statement:html for name, case_statement, html in synthetic_cases}[statement]
+    result=bench_parse(html,statement,repeat=3)
+    assert result['same']
+    assert result['speedup'] > 2
+
+def test_frame_to_num_is_faster():
+    result=bench_convert(make_value_frame(companies=20),repeat=3)
+    assert result['same']
+    assert result['speedup'] > 1
+
+def test_recorded_snapshots():
+    cases=load_fixtures()
+    if not cases:
+        pytest.skip('there are no recorded pages in scrape/fixtures, save them with record_html')
+    for name, statement, html in cases:
+        assert bench_parse(html,statement,repeat=1)['same'], name
+
+def test_main_save_json_report(tmp_path,capsys):
+    path=tmp_path/'bench.json'
+    main(['--repeat','1','--companies','5','--quarters','8','--json',str(path)])
+    with open(path) as file:
+        report=json.load(file)
+    assert {'python','pandas','numpy'} <= set(report['versions'])
+    assert {stage['stage'] for stage in report['stages']} == set(STAGES)
+    assert 'same output True' in capsys.readouterr().out
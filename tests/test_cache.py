@@ -0,0 +1,49 @@
+''' Tests of the on-disk response cache. '''
+
+#Import Necessary Library
+import time as waktu
+import pytest
+from scrape.cache import ResponseCache, CacheMissError
+
+@pytest.fixture
+def cache(tmp_path):
+    cache=ResponseCache(str(tmp_path/'cache.sqlite'),ttl=3600,max_entries=2)
+    yield cache
+    cache.close()
+
+def test_fresh_entry_is_a_hit(cache):
+    cache.put('AAA','Income Statement','<html>')
+    assert cache.get('AAA','Income Statement') == '<html>'
+    assert cache.get('BBB','Income Statement') is None
+    assert cache.stats() == {'hits':1,'misses':1,'revalidated':0,'entries':1}
+
+def test_stale_entry_is_a_miss(cache):
+    cache.put('AAA','Income Statement','<html>')
+    cache.ttl=0
+    assert cache.get('AAA','Income Statement') is None
+    entry, usable=cache.lookup('AAA','Income Statement')
+    assert entry['body'] == '<html>' and not entry['fresh'] and not usable
+    assert cache.evict_expired() == 1
+
+def test_least_recently_used_entry_is_removed(cache):
+    cache.put('AAA','Income Statement','a')
+    waktu.sleep(0.01)
+    cache.put('BBB','Income Statement','b')
+    waktu.sleep(0.01)
+    #Reading AAA make BBB the least recently used entry
+    cache.get('AAA','Income Statement')
+    waktu.sleep(0.01)
+    cache.put('CCC','Income Statement','c')
+    assert cache.get('AAA','Income Statement') == 'a'
+    assert cache.get('BBB','Income Statement') is None
+    assert cache.get('CCC','Income Statement') == 'c'
+
+def test_cache_only_use_stale_entry_and_raise_on_miss(cache):
+    cache.put('AAA','Income Statement','<html>')
+    cache.ttl=0
+    cache.cache_only=True
+    assert cache.get('AAA','Income Statement') == '<html>'
+    with pytest.raises(CacheMissError) as error:
+        cache.get('BBB','Income Statement')
+    assert error.value.company_code == 'BBB'
+    assert cache.stats()['misses'] == 1
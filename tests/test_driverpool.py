@@ -0,0 +1,98 @@
+''' Tests of the web driver pool with fake drivers. '''
+
+#Import Necessary Library
+import threading
+import time as waktu
+import pytest
+from scrape.ScraFSY import DriverPool, BrowserProfile
+
+class FakeDriver():
+    '''Driver that can stop responding and know whether it is quit.'''
+    def __init__(self):
+        self.alive=True
+        self.quit_called=False
+
+    def execute_script(self,script):
+        if not self.alive:
+            raise RuntimeError('chrome not reachable')
+        return 1
+
+    def quit(self):
+        self.quit_called=True
+
+class FakePool(DriverPool):
+    '''DriverPool that start fake drivers.'''
+    def __init__(self,**kwargs):
+        super().__init__(**kwargs)
+        self.started=[]
+
+    def new_driver(self):
+        driver=FakeDriver()
+        self.started.append(driver)
+        return driver
+
+def test_driver_is_reused():
+    pool=FakePool(size=2)
+    driver=pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    assert len(pool.started) == 1
+
+def test_size_cap_and_acquire_timeout():
+    pool=FakePool(size=2)
+    first, second=pool.acquire(), pool.acquire()
+    assert first is not second and pool.created == 2
+    started=waktu.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
+    assert waktu.monotonic()-started < 2
+    assert len(pool.started) == 2
+
+def test_waiting_acquire_get_released_driver():
+    pool=FakePool(size=1)
+    driver=pool.acquire()
+    threading.Timer(0.1,pool.release,args=(driver,)).start()
+    assert pool.acquire(timeout=5) is driver
+
+def test_driver_is_recycled_after_max_pages():
+    pool=FakePool(size=1,max_pages=2)
+    driver=pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    pool.release(driver)
+    assert driver.quit_called and pool.created == 0
+    assert pool.acquire() is not driver
+
+def test_dead_and_broken_drivers_are_replaced():
+    pool=FakePool(size=1)
+    driver=pool.acquire()
+    pool.release(driver)
+    driver.alive=False
+    replacement=pool.acquire()
+    assert replacement is not driver and driver.quit_called
+    pool.release(replacement,broken=True)
+    assert replacement.quit_called and pool.created == 0
+
+def test_failed_start_free_the_slot():
+    class BrokenPool(DriverPool):
+        def new_driver(self):
+            raise RuntimeError('no chromedriver')
+    pool=BrokenPool(size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.created == 0
+
+def test_close_quit_idle_drivers():
+    with FakePool(size=2) as pool:
+        drivers=[pool.acquire(),pool.acquire()]
+        for driver in drivers:
+            pool.release(driver)
+    assert all(driver.quit_called for driver in drivers)
+    assert pool.created == 0
+
+def test_headless_come_from_profile():
+    assert DriverPool().profile.headless
+    pool=DriverPool(profile=BrowserProfile(headless=False))
+    assert not pool.profile.headless
+    with pytest.raises(TypeError):
+        DriverPool(headless=False)
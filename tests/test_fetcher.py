@@ -0,0 +1,29 @@
+''' Tests of the browserless fetcher. '''
+
+#Import Necessary Library
+import json
+import pytest
+from scrape.cache import ResponseCache
+from scrape.fetcher import BaseFetcher, HttpFetcher
+
+def test_response_without_data_is_not_cached(server,fixture_dir,tmp_path):
+    (fixture_dir/'EMPTY').mkdir()
+    with open(fixture_dir/'EMPTY'/'income_statement.json','w') as file:
+        json.dump({'timeseries':{'result':[]}},file)
+    cache=ResponseCache(str(tmp_path/'cache.sqlite'))
+    fetcher=HttpFetcher(server.url,cache=cache)
+    with pytest.raises(ValueError):
+        fetcher.fetch_table('EMPTY','Income Statement')
+    assert cache.stats()['entries'] == 0
+    features, collect, headers, time, note=fetcher.fetch_table('AAA','Income Statement')
+    assert len(time) == 6
+    assert cache.stats()['entries'] == 1
+    payload, response=fetcher.fetch_payload('AAA','Income Statement')
+    assert response is None
+    cache.close()
+
+def test_fetcher_without_fetch_table_cannot_be_created():
+    class NoTableFetcher(BaseFetcher):
+        pass
+    with pytest.raises(TypeError):
+        NoTableFetcher()
@@ -0,0 +1,71 @@
+''' Tests of the incremental refresh. '''
+
+#Import Necessary Library
+import json
+import numpy as np
+import pandas as pd
+from scrape.ScraFSY import YFinanceScrapper
+from scrape.cache import ResponseCache
+from scrape.fetcher import HttpFetcher
+from scrape.incremental import changed_rows, is_due, update_company, refresh
+from scrape.storage import StatementStore
+
+def frame(times,**columns):
+    return pd.DataFrame({'Company':'AAA','Time':pd.to_datetime(times),**columns})
+
+def test_changed_rows_keep_new_and_restated_rows():
+    old=frame(['2022-09-30','2022-06-30'],Revenue=[2.0,1.0],Income=[np.nan,0.5])
+    new=frame(['2022-12-31','2022-09-30','2022-06-30'],Revenue=[3.0,2.5,1.0],Income=[0.7,np.nan,0.5])
+    changed=changed_rows(old,new)
+    assert list(changed['Time'].dt.month) == [12,9]
+    assert len(changed_rows(None,new)) == 3
+
+def test_changed_rows_treat_nan_as_equal():
+    old=frame(['2022-09-30'],Revenue=[np.nan])
+    assert changed_rows(old,frame(['2022-09-30'],Revenue=[np.nan])).empty
+
+def test_changed_rows_keep_rows_with_new_column():
+    old=frame(['2022-09-30'],Revenue=[2.0])
+    new=frame(['2022-09-30'],Revenue=[2.0],Income=[1.0])
+    assert len(changed_rows(old,new)) == 1
+
+def test_is_due_at_boundary(tmp_path):
+    store=StatementStore(str(tmp_path))
+    assert is_due(store,'AAA','Income Statement')
+    store.write(frame(['2022-12-31'],Revenue=[1.0]),'income_statement')
+    #91 days of the quarter and 45 days of reporting lag after 2022-12-31
+    assert not is_due(store,'AAA','Income Statement',today='2023-05-15')
+    assert is_due(store,'AAA','Income Statement',today='2023-05-16')
+
+def statuses(report):
+    return [(statement,status,rows) for company, statement, status, rows, error in report]
+
+def test_update_company_status(server,fixture_dir,tmp_path):
+    store=StatementStore(str(tmp_path/'store'))
+    scraper=YFinanceScrapper('AAA',fetcher=HttpFetcher(server.url))
+    statements=['Income Statement']
+    assert statuses(update_company(scraper,store,statements,today='2023-01-01')) == [
+        ('Income Statement','updated',6)]
+    assert statuses(update_company(scraper,store,statements,today='2023-01-01')) == [
+        ('Income Statement','skipped',0)]
+    assert statuses(update_company(scraper,store,statements,today='2023-01-01',force=True)) == [
+        ('Income Statement','unchanged',0)]
+    #Restate one quarter of the stored statement
+    path=fixture_dir/'AAA'/'income_statement.json'
+    with open(path) as file:
+        payload=json.load(file)
+    payload['timeseries']['result'][0]['quarterlyTotalRevenue'][1]['reportedValue']['raw']=1.0
+    with open(path,'w') as file:
+        json.dump(payload,file)
+    assert statuses(update_company(scraper,store,statements,today='2023-01-01',force=True)) == [
+        ('Income Statement','updated',1)]
+    #The table show thousands, so 1.0 become 0
+    assert store.read('income_statement')['Total Revenue'].iloc[1] == 0
+
+def test_failed_status_keep_error(server,tmp_path):
+    cache=ResponseCache(str(tmp_path/'cache.sqlite'),cache_only=True)
+    report=refresh(['AAA'],StatementStore(str(tmp_path/'store')),statements=['Cash Flow'],
+        fetcher=HttpFetcher(server.url,cache=cache))
+    assert list(report['Status']) == ['failed']
+    assert report['Error'][0].startswith('CacheMissError: ')
+    cache.close()
@@ -0,0 +1,42 @@
+''' Tests of the panel metric engine. '''
+
+#Import Necessary Library
+import numpy as np
+import pandas as pd
+from scrape.benchmark import scrape_html
+from scrape.metrics import compute_metrics, stack_statements, FEATURES, RATIOS
+
+def test_compute_metrics_match_metric_dataframe(pages):
+    scraper=scrape_html('AAA',pages)
+    scraper.important_dataframe()
+    expected=scraper.metric_dataframe().set_index(['company','time']).sort_index()
+    panel=stack_statements(scraper.income_statement,scraper.balance_sheet,scraper.cash_flow)
+    columns=[name for name in expected.columns if name in RATIOS]
+    result=compute_metrics(panel,ratios=columns,growths=[])
+    assert len(columns) == 12
+    assert list(result.index.get_level_values('Time')) == list(expected.index.get_level_values('time'))
+    #metric_dataframe give inf for division by zero, compute_metrics give nan
+    expected=expected[columns].replace([np.inf,-np.inf],np.nan).to_numpy(dtype='float64')
+    assert np.allclose(result[columns].to_numpy(),expected,equal_nan=True)
+
+def make_panel(times,net_income):
+    index=pd.MultiIndex.from_arrays([['AAA']*len(times),pd.to_datetime(times)],names=['Company','Time'])
+    panel=pd.DataFrame(np.nan,index=index,columns=list(FEATURES))
+    panel['net_income']=net_income
+    panel['total_revenue']=10.0
+    return panel
+
+def test_ttm_and_growth_are_nan_across_missing_quarter():
+    times=['2022-03-31','2022-06-30','2022-09-30','2022-12-31','2023-03-31','2023-09-30','2023-12-31']
+    panel=make_panel(times,[1.0,2.0,3.0,4.0,5.0,7.0,8.0])
+    result=compute_metrics(panel,ratios=['ttm_net_profit_margin'],growths=['net_income_qoq_growth'])
+    ttm=result['ttm_net_profit_margin'].to_numpy()
+    growth=result['net_income_qoq_growth'].to_numpy()
+    assert np.allclose(ttm,[np.nan,np.nan,np.nan,0.25,0.35,np.nan,np.nan],equal_nan=True)
+    assert np.allclose(growth,[np.nan,1.0,0.5,1/3,0.25,np.nan,1/7],equal_nan=True)
+
+def test_growth_do_not_cross_companies():
+    panel=pd.concat([make_panel(['2022-09-30','2022-12-31'],[1.0,2.0]),
+        make_panel(['2022-09-30','2022-12-31'],[4.0,8.0]).rename(index={'AAA':'BBB'})])
+    result=compute_metrics(panel,ratios=[],growths=['net_income_qoq_growth'])
+    assert np.allclose(result['net_income_qoq_growth'].to_numpy(),[np.nan,1.0,np.nan,1.0],equal_nan=True)
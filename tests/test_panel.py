@@ -0,0 +1,45 @@
+''' Tests of the memory-compact statement panel. '''
+
+#Import Necessary Library
+import numpy as np
+import pandas as pd
+from scrape.panel import CompactPanel, choose_dtype, memory_report
+
+def frame(company_code,**columns):
+    times=pd.to_datetime(['2022-12-31','2022-09-30'])
+    return pd.DataFrame({'Company':company_code,'Time':times,**columns})
+
+def frames():
+    return [frame('AAA',Revenue=[1.0,2.0],Income=[0.5,np.nan]),
+        frame('BBB',Revenue=[3.0,4.0],Interest=[0.25,0.75])]
+
+def test_from_frames_share_line_items():
+    panel=CompactPanel.from_frames(frames())
+    assert panel.items == ['Revenue','Income','Interest']
+    assert list(panel.companies) == ['AAA','AAA','BBB','BBB']
+    assert np.allclose(panel.item('Interest'),[np.nan,np.nan,0.25,0.75],equal_nan=True)
+    assert panel.values.dtype == np.float32
+    assert panel.to_frame().shape == (4,5)
+
+def test_choose_dtype_fall_back_to_float64():
+    assert choose_dtype(np.array([1.0,0.5,np.nan])) == np.float32
+    assert choose_dtype(np.array([0.1])) == np.float64
+    assert choose_dtype(np.array([1e300])) == np.float64
+    panel=CompactPanel.from_frames([frame('AAA',Revenue=[0.1,2.0])])
+    assert panel.values.dtype == np.float64
+
+def test_company_frame_round_trip():
+    original=frames()
+    panel=CompactPanel.from_frames(original)
+    for df in original:
+        result=panel.company_frame(df['Company'].iloc[0])
+        pd.testing.assert_frame_equal(result,df,check_dtype=False)
+
+def test_memory_report_fields():
+    report=memory_report(frames()+[None])
+    assert report['companies'] == 2
+    assert report['bytes_after'] == CompactPanel.from_frames(frames()).nbytes()
+    assert report['bytes_per_company_before'] == report['bytes_before']/2
+    assert report['ratio'] == report['bytes_before']/report['bytes_after']
+    assert report['ratio'] > 1
+    assert report['dtype'] == 'float32'
@@ -0,0 +1,85 @@
+''' Tests of the resumable job queue, circuit breaker, and scheduler. '''
+
+#Import Necessary Library
+import time as waktu
+import pytest
+from scrape.cache import ResponseCache
+from scrape.fetcher import HttpFetcher
+from scrape.scheduler import JobQueue, CircuitBreaker, Scheduler
+from scrape.storage import StatementStore
+
+@pytest.fixture
+def jobs(tmp_path):
+    jobs=JobQueue(str(tmp_path/'jobs.sqlite'))
+    yield jobs
+    jobs.close()
+
+def test_add_is_idempotent(jobs):
+    assert jobs.add(['AAA','BBB']) == 6
+    assert jobs.add(['AAA','BBB','CCC']) == 3
+    assert jobs.counts() == {'pending':9,'running':0,'done':0,'failed':0}
+
+def test_running_jobs_are_recovered_after_restart(tmp_path):
+    path=str(tmp_path/'jobs.sqlite')
+    jobs=JobQueue(path)
+    jobs.add(['AAA'],['Income Statement','Balance Sheet'])
+    company_code, statement, attempts=jobs.claim()
+    jobs.finish(*jobs.claim()[:2])
+    jobs.close()
+    #The process stopped while the first job was running
+    jobs=JobQueue(path)
+    assert jobs.recovered == 1
+    assert jobs.counts() == {'pending':1,'running':0,'done':1,'failed':0}
+    assert jobs.claim() == (company_code,statement,attempts)
+    jobs.close()
+
+def test_failed_job_wait_for_retry(jobs):
+    jobs.add(['AAA'],['Income Statement'])
+    jobs.claim(now=0)
+    jobs.fail('AAA','Income Statement','boom',retry_at=100)
+    assert jobs.claim(now=50) is None
+    assert jobs.next_wait(now=50) == 50
+    assert jobs.claim(now=100) == ('AAA','Income Statement',1)
+
+def test_circuit_breaker_transitions():
+    breaker=CircuitBreaker(window=4,threshold=0.5,cooldown=10,min_calls=4)
+    for success in (True,False,True):
+        breaker.record(success,now=0)
+    assert breaker.state == 'closed' and breaker.allow(now=0)
+    breaker.record(False,now=1)
+    assert breaker.state == 'open' and breaker.opened == 1
+    assert not breaker.allow(now=10)
+    assert breaker.allow(now=11) and breaker.state == 'half-open'
+    breaker.record(False,now=11)
+    assert breaker.state == 'open' and breaker.reopen_time == 21
+    assert breaker.allow(now=21)
+    breaker.record(True,now=21)
+    assert breaker.state == 'closed' and len(breaker.outcomes) == 0
+
+def test_scheduler_store_finished_jobs(jobs,server,tmp_path):
+    store=StatementStore(str(tmp_path/'store'))
+    jobs.add(['AAA','BBB'])
+    counts=Scheduler(jobs,store,fetcher=HttpFetcher(server.url)).run()
+    assert counts == {'pending':0,'running':0,'done':6,'failed':0}
+    assert store.companies('balance_sheet') == ['AAA','BBB']
+    assert len(store.read('cash_flow',companies=['AAA'])) == 6
+
+def test_scheduler_keep_error_cause(jobs,server,tmp_path):
+    cache=ResponseCache(str(tmp_path/'cache.sqlite'),cache_only=True)
+    fetcher=HttpFetcher(server.url,cache=cache)
+    jobs.add(['AAA'],['Income Statement'])
+    scheduler=Scheduler(jobs,StatementStore(str(tmp_path/'store')),retries=1,backoff=0.01,
+        breaker=CircuitBreaker(cooldown=0.01),fetcher=fetcher)
+    assert scheduler.run()['failed'] == 1
+    error=jobs.report()['Error'][0]
+    assert error.startswith('CacheMissError')
+    cache.close()
+
+def test_open_breaker_respect_max_seconds(jobs,tmp_path):
+    jobs.add(['AAA'],['Income Statement'])
+    breaker=CircuitBreaker(cooldown=300)
+    breaker.trip(waktu.time())
+    scheduler=Scheduler(jobs,StatementStore(str(tmp_path/'store')),breaker=breaker)
+    started=waktu.monotonic()
+    assert scheduler.run(max_seconds=0.3)['pending'] == 1
+    assert waktu.monotonic()-started < 2
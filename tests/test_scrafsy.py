@@ -0,0 +1,95 @@
+''' Tests of the parsers and the value conversion of YFinanceScrapper. '''
+
+#Import Necessary Library
+import numpy as np
+import pandas as pd
+import pytest
+from scrape.ScraFSY import YFinanceScrapper, TableFormatError, ParseError, NavigationError
+from scrape.cache import ResponseCache
+from scrape.benchmark import make_value_frame, parse_with
+
+@pytest.mark.parametrize('statement',['Income Statement','Balance Sheet','Cash Flow'])
+def test_lxml_and_bs4_give_same_output(pages,statement):
+    bs4_result=parse_with('bs4',pages[statement],statement)
+    lxml_result=parse_with('lxml',pages[statement],statement)
+    assert bs4_result == lxml_result
+    collect, headers, time, features, note=lxml_result
+    assert len(time) == 8
+    assert note == ['Currency in IDR. All numbers in thousands']
+
+def test_frame_to_num_match_value_to_num():
+    scraper=YFinanceScrapper('TEST')
+    df=make_value_frame(companies=3,items=20)
+    expected=df.map(scraper.value_to_num).to_numpy(dtype='float64')
+    assert np.allclose(scraper.frame_to_num(df).to_numpy(),expected,equal_nan=True)
+
+def test_frame_to_num_handle_suffix_and_parentheses():
+    scraper=YFinanceScrapper('TEST')
+    df=pd.DataFrame([['1,234','-',''],['2.5K','(7)','(1.5M)'],[' 3 ',None,'4.2B']])
+    expected=[[1234,np.nan,np.nan],[2500,-7,-1.5e6],[3,np.nan,4.2e9]]
+    assert np.allclose(scraper.frame_to_num(df).to_numpy(),expected,equal_nan=True)
+
+@pytest.mark.parametrize('cell',['abc','1.2.3','Nob'])
+def test_frame_to_num_raise_on_text(cell):
+    scraper=YFinanceScrapper('TEST')
+    with pytest.raises(ValueError):
+        scraper.frame_to_num(pd.DataFrame([['1',cell]]))
+
+def test_create_dataframe_raise_table_format_error(pages):
+    scraper=YFinanceScrapper('TEST')
+    scraper.parser='lxml'
+    collect, headers, time=scraper.parse_data(pages['Balance Sheet'],'Balance Sheet')
+    collect[3][2]='not a number'
+    with pytest.raises(TableFormatError) as error:
+        scraper.create_dataframe(collect,headers,time,'Balance Sheet')
+    assert isinstance(error.value.__cause__,ValueError)
+    assert 'not a number' in str(error.value.__cause__)
+    assert scraper.instrumentation.snapshot()['counters']['failures'] == 1
+
+def load_page(scraper,html):
+    '''Replace the browser of get_html_data with a fixed page.'''
+    def get_html_data(statement):
+        scraper.html=html
+        return scraper.make_content(html)
+    scraper.get_html_data=get_html_data
+
+def test_page_is_cached_only_after_parse(pages,tmp_path):
+    cache=ResponseCache(str(tmp_path/'cache.sqlite'))
+    scraper=YFinanceScrapper('AAA',cache=cache)
+    scraper.parser='lxml'
+    load_page(scraper,'<html><body>Please accept the cookies</body></html>')
+    with pytest.raises(ParseError):
+        scraper.get_finance_data('Balance Sheet')
+    assert cache.stats()['entries'] == 0
+    scraper.reset_data()
+    load_page(scraper,pages['Balance Sheet'])
+    scraper.get_finance_data('Balance Sheet')
+    assert cache.get('AAA','Balance Sheet') == pages['Balance Sheet']
+    cache.close()
+
+class RowsDriver():
+    '''Driver that show a fixed number of table rows.'''
+    def __init__(self,rows):
+        self.rows=rows
+
+    def execute_script(self,script):
+        return self.rows
+
+def test_wait_until_ready_raise_when_no_row_appear():
+    scraper=YFinanceScrapper('AAA')
+    scraper.ready_timeout=0.2
+    scraper.ready_poll=0.01
+    scraper.ready_stable=0.05
+    assert scraper.wait_until_ready(RowsDriver(12)) < 0.2
+    with pytest.raises(NavigationError):
+        scraper.wait_until_ready(RowsDriver(0),'Balance Sheet')
+
+def test_convert_to_csv_raise_on_unknown_table():
+    scraper=YFinanceScrapper('TEST')
+    with pytest.raises(ValueError,match='There is no table'):
+        scraper.convert_to_csv('incomestatement')
+
+def test_important_dataframe_raise_before_scrape():
+    scraper=YFinanceScrapper('TEST')
+    with pytest.raises(ValueError):
+        scraper.important_dataframe()
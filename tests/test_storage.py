@@ -0,0 +1,43 @@
+''' Tests of the partitioned statement store. '''
+
+#Import Necessary Library
+import pandas as pd
+import pytest
+from scrape.ScraFSY import YFinanceScrapper
+from scrape.storage import StatementStore
+
+def statement(company_code,times,values,column='Total Revenue'):
+    return pd.DataFrame({'Company':company_code,'Time':pd.to_datetime(times),column:values})
+
+@pytest.mark.parametrize('file_format',['parquet','feather'])
+def test_upsert_replace_same_period_and_add_new(tmp_path,file_format):
+    store=StatementStore(str(tmp_path),file_format=file_format)
+    store.write(statement('AAA',['2022-09-30','2022-06-30'],[2.0,1.0]),'income_statement')
+    rows=store.write(statement('AAA',['2022-12-31','2022-09-30'],[3.0,2.5]),'income_statement')
+    df=store.read('income_statement')
+    assert rows == 3
+    assert list(df['Time'].dt.strftime('%Y-%m-%d')) == ['2022-12-31','2022-09-30','2022-06-30']
+    assert list(df['Total Revenue']) == [3.0,2.5,1.0]
+    assert list(store.periods('income_statement','AAA').dt.month) == [12,9,6]
+
+@pytest.mark.parametrize('file_format',['parquet','feather'])
+def test_read_companies_with_different_columns(tmp_path,file_format):
+    store=StatementStore(str(tmp_path),file_format=file_format)
+    store.write(statement('AAA',['2022-12-31'],[1.0]),'income_statement')
+    store.write(statement('BBB',['2022-12-31'],[2.0],column='Net Income'),'income_statement')
+    df=store.read('income_statement',columns=['Company','Total Revenue','Net Income','Unknown'])
+    assert list(df.columns) == ['Company','Total Revenue','Net Income']
+    assert sorted(df['Company']) == ['AAA','BBB']
+    assert df['Total Revenue'].isna().sum() == 1
+    assert store.read('income_statement',companies=['ZZZ']).empty
+
+def test_overwrite_and_unknown_mode(tmp_path):
+    store=StatementStore(str(tmp_path))
+    store.write(statement('AAA',['2022-09-30','2022-06-30'],[2.0,1.0]),'income_statement')
+    assert store.write(statement('AAA',['2022-12-31'],[3.0]),'income_statement',mode='overwrite') == 1
+    with pytest.raises(ValueError):
+        store.write(statement('AAA',['2022-12-31'],[3.0]),'income_statement',mode='merge')
+
+def test_convert_to_store_raise_on_unknown_table(tmp_path):
+    with pytest.raises(ValueError):
+        YFinanceScrapper('AAA').convert_to_store('income',StatementStore(str(tmp_path)))